@@ -1,75 +1,59 @@
+from __future__ import annotations
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd
-import os
+from lazy_import import lazy_module
+pd = lazy_module("pandas")
 
 from utils import style_row_tags_for_treeview, register_theme_listener
-
-LOG_PATH = "data/species_trait_logs.xlsx"
+from log_store import SPECIES_KEY, SpeciesAggregates, get_log_store
+from jobs import Debouncer, get_job_queue
+from log_search import IncrementalFilter, AUDIT_SEARCH_COLUMNS
+from shared_config import get_search_debounce_ms
+from tree_sync import RenderScheduler, TreeReconciler
+from events import LOG_CHANGED, RefreshWhenVisible, get_event_bus
 
 TABLE_COLUMNS = [
     "Genus", "Species", "Common Name", "Type", "Group",
     "Entries", "Leaf", "Bark", "Tree", "Other",
     "Scanned", "Archived", "Missing"
 ]
-
-def ensure_log_file():
-    os.makedirs("data", exist_ok=True)
-    if not os.path.exists(LOG_PATH):
-        cols = [
-            "Timestamp","Record ID","Genus","Species","Common Name","Type","Group",
-            "Photo Path","Has Leaf","Has Bark","Has Tree","Has Other","Scanned","Archived","Notes"
-        ]
-        pd.DataFrame(columns=cols).to_excel(LOG_PATH, index=False)
-
-def read_log_df() -> pd.DataFrame:
-    ensure_log_file()
-    try:
-        df = pd.read_excel(LOG_PATH)
-    except Exception:
-        df = pd.DataFrame(columns=[c for c in TABLE_COLUMNS if c not in ("Entries","Leaf","Bark","Tree","Other","Scanned","Archived","Missing")])
-    needed = [
-        "Timestamp","Record ID","Genus","Species","Common Name","Type","Group",
-        "Photo Path","Has Leaf","Has Bark","Has Tree","Has Other","Scanned","Archived","Notes"
-    ]
-    for c in needed:
-        if c not in df.columns:
-            df[c] = "" if c not in {"Has Leaf","Has Bark","Has Tree","Has Other","Scanned","Archived"} else False
-    return df[needed]
+KEY_COLUMNS = SPECIES_KEY   # one audit row per species key
+COUNT_COLUMNS = {   # SpeciesAggregates column -> audit column
+    "Has Leaf": "Leaf", "Has Bark": "Bark", "Has Tree": "Tree", "Has Other": "Other",
+}
+PART_COLUMNS = ["Leaf", "Bark", "Tree", "Other"]   # a zero count here is a missing part
+
+def audit_table(counts: pd.DataFrame) -> tuple[pd.DataFrame, list[str], list[str]]:
+    """Audit rows plus Type/Group choices from per-species counts (SpeciesAggregates.frame())."""
+    if counts.empty:
+        return pd.DataFrame(columns=TABLE_COLUMNS), [], []
+    counts = counts.rename(columns=COUNT_COLUMNS)
+    for c in KEY_COLUMNS:   # falsy keys (None, "") show as ""
+        counts[c] = counts[c].where(counts[c].astype(bool), "")
+    missing = pd.Series("", index=counts.index)
+    for part in PART_COLUMNS:
+        gap = counts[part] == 0
+        missing = missing.mask(gap, missing + ", " + part)
+    counts["Missing"] = missing.str.removeprefix(", ")
+    audit_df = counts[TABLE_COLUMNS]
+    types = sorted([t for t in counts["Type"].astype(str).unique().tolist() if t.strip()])
+    groups = sorted([g for g in counts["Group"].astype(str).unique().tolist() if g.strip()])
+    return audit_df, types, groups
 
 def compute_audit(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str], list[str]]:
+    """Full recompute from the log rows; the tab itself reads the store's maintained counts."""
     if df.empty:
         return pd.DataFrame(columns=TABLE_COLUMNS), [], []
-    # Normalize boolean-ish columns for safety
-    for col in ["Has Leaf","Has Bark","Has Tree","Has Other","Scanned","Archived"]:
-        df[col] = df[col].astype(str).str.lower().isin({"true","1","yes"}).fillna(False)
-
-    grouped = df.groupby(["Genus","Species","Common Name","Type","Group"], dropna=False)
-    rows = []
-    for (g, s, cn, typ, grp), grp_df in grouped:
-        entries   = len(grp_df)
-        leaf_ct   = int(grp_df["Has Leaf"].sum())
-        bark_ct   = int(grp_df["Has Bark"].sum())
-        tree_ct   = int(grp_df["Has Tree"].sum())
-        other_ct  = int(grp_df["Has Other"].sum())
-        scanned_ct= int(grp_df["Scanned"].sum())
-        archived_ct=int(grp_df["Archived"].sum())
-        missing = []
-        if leaf_ct == 0:  missing.append("Leaf")
-        if bark_ct == 0:  missing.append("Bark")
-        if tree_ct == 0:  missing.append("Tree")
-        if other_ct == 0: missing.append("Other")
-        rows.append({
-            "Genus": g or "", "Species": s or "", "Common Name": cn or "",
-            "Type": typ or "", "Group": grp or "",
-            "Entries": entries, "Leaf": leaf_ct, "Bark": bark_ct, "Tree": tree_ct, "Other": other_ct,
-            "Scanned": scanned_ct, "Archived": archived_ct,
-            "Missing": ", ".join(missing)
-        })
-    audit_df = pd.DataFrame(rows, columns=TABLE_COLUMNS)
-    types = sorted([t for t in df["Type"].dropna().astype(str).unique().tolist() if t.strip()])
-    groups = sorted([g for g in df["Group"].dropna().astype(str).unique().tolist() if g.strip()])
-    return audit_df, types, groups
+    return audit_table(SpeciesAggregates.sums(df).reset_index())
+
+def load_audit(seen_version=None):
+    """(log version, audit_table result), or None if the log is still at seen_version."""
+    store = get_log_store()
+    if store.snapshot()[0] == seen_version:
+        return None
+    version, counts = store.species_counts()
+    return version, audit_table(counts)
 
 def build_audit_tab(notebook: ttk.Notebook):
     frame = ttk.Frame(notebook)
@@ -88,7 +72,8 @@ def build_audit_tab(notebook: ttk.Notebook):
     group_cb.pack(side="left")
 
     only_missing = tk.BooleanVar(value=False)
-    ttk.Checkbutton(card, text="Only Missing Parts", variable=only_missing).pack(side="left", padx=10)
+    ttk.Checkbutton(card, text="Only Missing Parts", variable=only_missing,
+                    command=lambda: apply_filters()).pack(side="left", padx=10)
 
     card.pack_propagate(False); card.update_idletasks()
     spacer = ttk.Frame(card); spacer.pack(side="left", expand=True, fill="x")
@@ -100,6 +85,15 @@ def build_audit_tab(notebook: ttk.Notebook):
     ttk.Button(card, text="Export CSV", command=lambda: export_csv()).pack(side="left", padx=8)
     ttk.Button(card, text="Export Excel", command=lambda: export_excel()).pack(side="left")
 
+    busy_var = tk.StringVar(value="")
+    ttk.Label(card, textvariable=busy_var, style="Muted.TLabel").pack(side="left", padx=8)
+    loading_var = tk.StringVar(value="")
+    ttk.Label(card, textvariable=loading_var, style="Muted.TLabel").pack(side="left")
+    jobs = get_job_queue(frame)
+
+    def set_busy(flag: bool):
+        busy_var.set("Working…" if flag else "")
+
     # ───────── Table ─────────
     table_cols = TABLE_COLUMNS
     table_frame = ttk.Frame(frame)
@@ -124,17 +118,42 @@ def build_audit_tab(notebook: ttk.Notebook):
         style_row_tags_for_treeview(tree)
     _apply_row_tag_styles()
     register_theme_listener(_apply_row_tag_styles)
+    rows_view = TreeReconciler(tree)
+    renderer = RenderScheduler(tree, status=loading_var.set)
+
+    # computed audit, keyed by the log version it was built from
+    audit_cache = {"version": None, "result": None}
 
     def load_and_render():
-        df = read_log_df()
-        audit_df, types, groups = compute_audit(df)
+        """Recompute the audit in the background if the log changed since the cached one."""
+        jobs.submit(load_audit, audit_cache["version"], key="audit-load",
+                    on_done=loaded, busy=set_busy,
+                    on_error=lambda e: messagebox.showerror("Audit", f"Could not read log:\n{e}"))
+
+    def loaded(fresh):
+        if fresh is None:
+            return  # log unchanged; what is shown is current
+        audit_cache["version"], audit_cache["result"] = fresh
+        render()
+
+    def apply_filters():
+        """Filter changes only re-filter the cached audit; the log is just checked for changes."""
+        if audit_cache["result"] is not None:
+            render()
+        load_and_render()
+
+    search = IncrementalFilter(AUDIT_SEARCH_COLUMNS)
+
+    def render():
+        audit_df, types, groups = audit_cache["result"]
 
         # refresh filter options
         tv = ["All"] + types; gv = ["All"] + groups
         if tuple(type_cb["values"]) != tuple(tv): type_cb["values"] = tv
         if tuple(group_cb["values"]) != tuple(gv): group_cb["values"] = gv
 
-        out = audit_df
+        # search first, over the whole audit table, so growing terms narrow the last result
+        out = search.filter(audit_df, search_var.get())
         if type_cb.get() != "All":
             out = out[out["Type"].astype(str) == type_cb.get()]
         if group_cb.get() != "All":
@@ -143,19 +162,14 @@ def build_audit_tab(notebook: ttk.Notebook):
         if only_missing.get():
             out = out[out["Missing"].astype(str).str.len() > 0]
 
-        term = search_var.get().strip().lower()
-        if term:
-            m = False
-            for c in ["Genus","Species","Common Name","Group","Type","Missing"]:
-                m = m | out[c].astype(str).str.lower().str.contains(term, na=False)
-            out = out[m]
-
-        tree.delete(*tree.get_children())
-        for i, r in out.iterrows():
-            tags = []
-            if i % 2 == 0: tags.append("zebra_even")
-            if str(r.get("Missing","")).strip(): tags.append("missing")
-            tree.insert("", "end", values=[r.get(c, "") for c in table_cols], tags=tuple(tags))
+        def rows():
+            for i, r in zip(out.index, out.to_dict(orient="records")):
+                tags = []
+                if i % 2 == 0: tags.append("zebra_even")
+                if str(r.get("Missing","")).strip(): tags.append("missing")
+                yield (tuple(r[c] for c in KEY_COLUMNS),
+                       [r.get(c, "") for c in table_cols], tags)
+        renderer.start(rows_view.steps(rows()), len(out))
 
     def export_csv():
         out = tree_to_df()
@@ -164,10 +178,9 @@ def build_audit_tab(notebook: ttk.Notebook):
         path = filedialog.asksaveasfilename(title="Export Audit (CSV)", defaultextension=".csv",
                                             filetypes=[("CSV","*.csv")])
         if not path: return
-        try:
-            out.to_csv(path, index=False); messagebox.showinfo("Export", f"Saved: {path}")
-        except Exception as e:
-            messagebox.showerror("Export Error", str(e))
+        jobs.submit(lambda: out.to_csv(path, index=False),
+                    on_done=lambda _: messagebox.showinfo("Export", f"Saved: {path}"),
+                    on_error=lambda e: messagebox.showerror("Export Error", str(e)), busy=set_busy)
 
     def export_excel():
         out = tree_to_df()
@@ -176,10 +189,9 @@ def build_audit_tab(notebook: ttk.Notebook):
         path = filedialog.asksaveasfilename(title="Export Audit (Excel)", defaultextension=".xlsx",
                                             filetypes=[("Excel","*.xlsx")])
         if not path: return
-        try:
-            out.to_excel(path, index=False); messagebox.showinfo("Export", f"Saved: {path}")
-        except Exception as e:
-            messagebox.showerror("Export Error", str(e))
+        jobs.submit(lambda: out.to_excel(path, index=False),
+                    on_done=lambda _: messagebox.showinfo("Export", f"Saved: {path}"),
+                    on_error=lambda e: messagebox.showerror("Export Error", str(e)), busy=set_busy)
 
     def tree_to_df() -> pd.DataFrame:
         rows = []
@@ -189,13 +201,19 @@ def build_audit_tab(notebook: ttk.Notebook):
         return pd.DataFrame(rows, columns=table_cols)
 
     # Events
-    type_cb.bind("<<ComboboxSelected>>", lambda e: load_and_render())
-    group_cb.bind("<<ComboboxSelected>>", lambda e: load_and_render())
-    search_var.trace_add("write", lambda *_: load_and_render())
+    type_cb.bind("<<ComboboxSelected>>", lambda e: apply_filters())
+    group_cb.bind("<<ComboboxSelected>>", lambda e: apply_filters())
+    search_debounce = Debouncer(frame, get_search_debounce_ms(), apply_filters)
+    search_var.trace_add("write", lambda *_: search_debounce())
     # (Removed redundant hidden tk.Checkbutton)
 
     # Shortcuts
     top = frame.winfo_toplevel()
     top.bind_all("<Control-f>", lambda e: (search_entry.focus_set(), search_entry.select_range(0,'end')))
 
-    load_and_render()
+    # Logger writes only mark the audit stale; it is recomputed when the tab is shown
+    refresher = RefreshWhenVisible(notebook, frame, load_and_render)
+    bus = get_event_bus()
+    for topic in LOG_CHANGED:
+        bus.subscribe(topic, refresher.mark_dirty)
+    refresher.mark_dirty()
@@ -1,73 +1,367 @@
+import heapq
 import tkinter as tk
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from itertools import islice
 from tkinter import ttk
 
+FUZZY_MIN_SCORE = 0.4   # trigram similarity below this is not offered as a suggestion
+
+
+def weight_rank(weights: list[float]) -> list[int]:
+    """rank[i] = place of item i when ordered by weight (highest first), ties by position."""
+    order = sorted(range(len(weights)), key=lambda i: (-weights[i], i))
+    rank = [0] * len(order)
+    for r, i in enumerate(order):
+        rank[i] = r
+    return rank
+
+
+def trigrams(key: str) -> set[str]:
+    """Trigrams of a casefolded key padded with a space each side, so word starts and ends count."""
+    key = f" {key} "
+    return {key[j:j + 3] for j in range(len(key) - 2)}
+
+
+class AliasIndex:
+    """
+    Match index over an alias list, built once per list. Casefolded keys are
+    kept sorted, so the prefix tier is a bisect range; a trigram -> item
+    postings map narrows the contains tier to a few candidates that are
+    then checked directly, and 1-2 character queries read their hits
+    straight from a postings map of every 1- and 2-character substring. Results keep the old ranking: prefix matches
+    first, then other substring matches, each alphabetical.
+
+    The same postings back fuzzy(): aliases ranked by trigram similarity to
+    the query, which tolerates typos ("quercis" still finds "quercus").
+
+    set_weights() ranks each tier by weight (e.g. how often the species is
+    logged) before falling back to alphabetical order.
+    """
+
+    def __init__(self, items):
+        pairs = sorted((x.casefold(), x) for x in items)
+        self.keys = [k for k, _ in pairs]
+        self.items = [x for _, x in pairs]
+        self.grams: dict[str, list[int]] = {}
+        self.short: dict[str, list[int]] = {}   # 1-2 char substring -> items containing it
+        self.gram_counts: list[int] = []
+        self.weights: list[float] | None = None
+        self.rank: list[int] | None = None
+        for i, k in enumerate(self.keys):
+            grams = trigrams(k)
+            self.gram_counts.append(len(grams))
+            for g in grams:
+                self.grams.setdefault(g, []).append(i)   # i ascending, so postings stay sorted
+            for g in {k[j:j + n] for n in (1, 2) for j in range(len(k) - n + 1)}:
+                self.short.setdefault(g, []).append(i)
+
+    def fuzzy(self, text: str, limit: int = 10, min_score: float = FUZZY_MIN_SCORE) -> list[tuple[float, int]]:
+        """
+        (similarity, position) of the aliases most like text, best first.
+        Similarity is the Jaccard index of the two trigram sets; aliases that
+        differ only in case are reported once.
+        """
+        grams = trigrams(text.strip().casefold())
+        shared = Counter()
+        for g in grams:
+            shared.update(self.grams.get(g, ()))
+        n = len(grams)
+        counts = self.gram_counts
+        scored = ((k / (n + counts[i] - k), i) for i, k in shared.items())
+        best = heapq.nlargest(limit * 2, (si for si in scored if si[0] >= min_score),
+                              key=lambda si: (si[0], -si[1]))
+        out, seen = [], set()
+        for score, i in best:
+            if self.keys[i] not in seen:
+                seen.add(self.keys[i])
+                out.append((score, i))
+        return out[:limit]
+
+    def set_weights(self, weights: list[float] | None, rank: list[int] | None = None):
+        """
+        Per-position weights (aligned with items), higher first; None for
+        alphabetical only. Pass rank = weight_rank(weights), computed off the
+        Tk thread, to skip sorting here.
+        """
+        self.weights = weights if weights and any(weights) else None
+        self.rank = None if self.weights is None else rank or weight_rank(self.weights)
+
+    def order_key(self, i: int) -> int:
+        return i if self.rank is None else self.rank[i]
+
+    def prefix_range(self, text: str) -> tuple[int, int]:
+        lo = bisect_left(self.keys, text)
+        return lo, bisect_left(self.keys, text + "\U0010ffff", lo)
+
+    def _contains(self, text: str):
+        if len(text) < 3:
+            return iter(self.short.get(text, ()))   # exact: every posting contains text
+        postings = [self.grams.get(text[j:j + 3], ()) for j in range(len(text) - 2)]
+        candidates = min(postings, key=len)
+        keys = self.keys
+        return (i for i in candidates if text in keys[i])
+
+    def iter_ranked(self, text: str):
+        """Positions (into items) matching text (already stripped), prefix hits first, lazily."""
+        text = text.casefold()
+        if not text:
+            return
+        lo, hi = self.prefix_range(text)
+        rest = (i for i in self._contains(text) if not lo <= i < hi)
+        if self.weights is None:
+            yield from range(lo, hi)
+            yield from rest
+        else:
+            yield from sorted(range(lo, hi), key=self.rank.__getitem__)
+            yield from sorted(rest, key=self.rank.__getitem__)
+
+    def iter_matches(self, text: str):
+        return (self.items[i] for i in self.iter_ranked(text))
+
+    def refine(self, ranked: list[int], text: str) -> list[int]:
+        """
+        Ranked positions for text, derived from the ranked positions of a
+        shorter query that text contains (every match of text is among them).
+        """
+        text = text.casefold()
+        keys = self.keys
+        hits = [i for i in ranked if text in keys[i]]
+        prefix = [i for i in hits if keys[i].startswith(text)]   # already in order
+        return prefix + sorted((i for i in hits if not keys[i].startswith(text)), key=self.order_key)
+
+    def matches(self, text: str, limit: int | None = None) -> list[str]:
+        return list(islice(self.iter_matches(text), limit))
+
+
+class RankedMatches:
+    """
+    Ranked positions for one query, pulled from the index's generator only as
+    far as they have been paged through; what was pulled is kept, so a cached
+    query resumes where it left off.
+    """
+
+    PULL = 50   # positions pulled at a time while iterating
+
+    def __init__(self, source):
+        self.pulled: list[int] = []
+        self._source = iter(source)
+        self.complete = False
+
+    @classmethod
+    def of(cls, positions: list[int]) -> "RankedMatches":
+        out = cls(())
+        out.pulled, out.complete = positions, True
+        return out
+
+    def _pull(self, n: int):
+        if self.complete:
+            return
+        got = len(self.pulled)
+        self.pulled.extend(islice(self._source, n))
+        if len(self.pulled) - got < n:
+            self.complete, self._source = True, None
+
+    def take(self, n: int) -> list[int]:
+        """The first n positions (fewer only if there are no more)."""
+        if len(self.pulled) < n:
+            self._pull(n - len(self.pulled))
+        return self.pulled[:n]
+
+    def __iter__(self):
+        i = 0
+        while i < len(self.pulled) or not self.complete:
+            if i == len(self.pulled):
+                self._pull(self.PULL)
+                continue
+            yield self.pulled[i]
+            i += 1
+
+
+class QueryCache:
+    """
+    LRU cache of casefolded query -> RankedMatches for one AliasIndex.
+    A query that extends a cached, fully pulled one ("quer" after "que") is
+    derived by filtering that result instead of searching the index again;
+    anything else starts a lazy search that pulls only the pages shown.
+    """
+
+    def __init__(self, index: AliasIndex, size: int = 64):
+        self.index = index
+        self.size = size
+        self.entries: OrderedDict[str, RankedMatches] = OrderedDict()
+
+    def ranked(self, text: str) -> RankedMatches:
+        key = text.casefold()
+        hit = self.entries.get(key)
+        if hit is not None:
+            self.entries.move_to_end(key)
+            return hit
+        for k in range(len(key) - 1, 0, -1):
+            base = self.entries.get(key[:k])
+            if base is not None and base.complete:
+                hit = RankedMatches.of(self.index.refine(base.pulled, key))
+                break
+        else:
+            hit = RankedMatches(self.index.iter_ranked(key))
+        self.entries[key] = hit
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return hit
+
+
 class AutocompleteEntry(ttk.Entry):
+    """
+    Entry with a dropdown of matching aliases. The dropdown shows the first
+    PAGE_SIZE matches and pulls the next page from the same match generator
+    when the list is scrolled to its end or Down moves past the last item,
+    so a keystroke costs at most one page however broad the query. The
+    Listbox is created once and hidden/shown rather than rebuilt.
+
+    Ranked results go through a QueryCache, so backspacing and retyping
+    reuse earlier results; it is replaced along with the alias list. When
+    the substring matches don't fill a page, typo-tolerant fuzzy matches
+    are listed after them. set_usage() ranks by usage and pins recently
+    used aliases (highlighted) above everything else.
+    """
+
+    PAGE_SIZE = 50
+    CACHE_SIZE = 64
+    PINNED_FG = "#b8860b"   # pinned (recently used) suggestions
+
     def __init__(self, autocomplete_list, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.autocomplete_list = sorted(autocomplete_list, key=str.lower)
+        self.index = AliasIndex(self.autocomplete_list)
+        self.cache = QueryCache(self.index, self.CACHE_SIZE)
 
         self.var = self["textvariable"] or tk.StringVar()
         self["textvariable"] = self.var
         self.var.trace_add("write", self.update_list)
 
         self.lb = None
+        self.lb_visible = False
         self.matches = []
+        self._more = None   # iterator of matches not yet in the listbox
+        self.pinned: list[str] = []
 
         # Keyboard & focus behavior
         self.bind("<Right>", self.accept_current)
         self.bind("<Return>", self.accept_current)
         self.bind("<Down>", self.move_down)
         self.bind("<Up>", self.move_up)
-        self.bind("<Escape>", lambda e: self.destroy_listbox())
-        self.bind("<FocusOut>", lambda e: self.after(100, self.destroy_listbox))
+        self.bind("<Escape>", lambda e: self.hide_listbox())
+        self.bind("<FocusOut>", lambda e: self.after(100, self.hide_listbox))
+
+    def set_autocomplete_list(self, autocomplete_list, index: AliasIndex | None = None):
+        """Replace the alias list; pass an index prebuilt off the Tk thread for large lists."""
+        self.autocomplete_list = sorted(autocomplete_list, key=str.lower)
+        self.index = index or AliasIndex(self.autocomplete_list)
+        self.cache = QueryCache(self.index, self.CACHE_SIZE)
+        self.pinned = []
+        if self.lb_visible:
+            self.update_list()
+
+    def set_usage(self, weights: list[float] | None, pinned: list[str], rank: list[int] | None = None):
+        """
+        Rank suggestions by weights (aligned with self.index.items, e.g. log
+        usage) and list the pinned aliases that match first.
+        """
+        self.index.set_weights(weights, rank)
+        self.cache = QueryCache(self.index, self.CACHE_SIZE)
+        self.pinned = list(pinned)
+        if self.lb_visible:
+            self.update_list()
+
+    def _ensure_listbox(self):
+        if self.lb is None:
+            self.lb = tk.Listbox(exportselection=False, yscrollcommand=self._on_scroll)
+            self.lb.bind("<Double-Button-1>", self.accept_current)
+            self.lb.bind("<Return>", self.accept_current)
+            self.lb.bind("<Escape>", lambda e: self.hide_listbox())
+        if not self.lb_visible:
+            self.lb.place(in_=self, relx=0, rely=1, relwidth=1)
+            self.lb.lift()
+            self.lb_visible = True
 
     def update_list(self, *_):
-        text = (self.var.get() or "").lower().strip()
+        text = (self.var.get() or "").strip()
         if not text:
-            self.destroy_listbox()
+            self.hide_listbox()
             return
 
-        # Prioritize prefix matches, then contains
-        starts = [x for x in self.autocomplete_list if x.lower().startswith(text)]
-        contains = [x for x in self.autocomplete_list if text in x.lower() and x not in starts]
-        self.matches = starts + contains
+        # Pinned first, then prefix matches, then contains; only the first page is fetched now
+        key = text.casefold()
+        pinned = [a for a in self.pinned if key in a.casefold()]
+        self._more = self._suggestions(text, pinned)
+        self.matches = list(islice(self._more, self.PAGE_SIZE))
 
         if not self.matches:
-            self.destroy_listbox()
+            self.hide_listbox()
             return
 
-        if not self.lb:
-            self.lb = tk.Listbox(exportselection=False)
-            self.lb.bind("<Double-Button-1>", self.accept_current)
-            self.lb.bind("<Return>", self.accept_current)
-            self.lb.bind("<Escape>", lambda e: self.destroy_listbox())
-            self.lb.place(in_=self, relx=0, rely=1, relwidth=1)
-
+        self._ensure_listbox()
         self.lb.delete(0, tk.END)
-        for item in self.matches:
-            self.lb.insert(tk.END, item)
+        self.lb.insert(tk.END, *self.matches)
+        for i in range(min(len(pinned), len(self.matches))):
+            self.lb.itemconfigure(i, foreground=self.PINNED_FG)
         self.lb.selection_clear(0, tk.END)
         self.lb.selection_set(0)
+        self.lb.see(0)
+
+    def _suggestions(self, text: str, pinned: list[str]):
+        """Pinned, then ranked matches for text; if they don't fill a page, close fuzzy matches follow."""
+        items = self.index.items
+        yield from pinned
+        skip = set(pinned)
+        ranked = self.cache.ranked(text)
+        first = ranked.take(self.PAGE_SIZE)
+        yield from (items[i] for i in ranked if items[i] not in skip)
+        if len(first) < self.PAGE_SIZE:
+            shown = set(first)
+            for _, i in self.index.fuzzy(text, limit=self.PAGE_SIZE - len(first)):
+                if i not in shown and items[i] not in skip:
+                    yield items[i]
+
+    def load_more(self) -> bool:
+        """Append the next page of matches; False when there are no more."""
+        if self._more is None:
+            return False
+        page = list(islice(self._more, self.PAGE_SIZE))
+        if len(page) < self.PAGE_SIZE:
+            self._more = None
+        if not page:
+            return False
+        self.matches.extend(page)
+        self.lb.insert(tk.END, *page)
+        return True
+
+    def _on_scroll(self, first, last):
+        if float(last) >= 1.0 and self._more is not None:
+            self.after_idle(self.load_more)
 
-    def destroy_listbox(self):
-        if self.lb:
-            self.lb.destroy()
-            self.lb = None
+    def hide_listbox(self):
+        if self.lb_visible:
+            self.lb.place_forget()
+            self.lb_visible = False
+        self._more = None
 
     def accept_current(self, event=None):
-        if self.lb:
+        if self.lb_visible:
             idxs = self.lb.curselection()
             if idxs:
                 self.var.set(self.lb.get(idxs[0]))
                 self.icursor(tk.END)
-            self.destroy_listbox()
+            self.hide_listbox()
 
     def move_down(self, event=None):
-        if not self.lb:
+        if not self.lb_visible:
             self.update_list()
             return "break"
         idxs = self.lb.curselection()
         n = (idxs[0] + 1) if idxs else 0
+        if n >= self.lb.size():
+            self.load_more()
         n = min(n, self.lb.size() - 1)
         self.lb.selection_clear(0, tk.END)
         self.lb.selection_set(n)
@@ -75,7 +369,7 @@ class AutocompleteEntry(ttk.Entry):
         return "break"
 
     def move_up(self, event=None):
-        if not self.lb:
+        if not self.lb_visible:
             return "break"
         idxs = self.lb.curselection()
         n = (idxs[0] - 1) if idxs else 0
@@ -0,0 +1,333 @@
+# bench.py — micro-benchmarks for the log hot paths
+# Usage: python bench.py [name ...]   (no names runs everything)
+import sys
+import time
+
+import pandas as pd
+
+BENCHES = {}
+
+
+def bench(fn):
+    BENCHES[fn.__name__] = fn
+    return fn
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def synthetic_log(n: int, n_species: int = 200, seed: int = 0) -> pd.DataFrame:
+    """n log rows spread over n_species (genus, species) pairs."""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    sp = rng.integers(0, n_species, n)
+    flags = rng.random((n, 6)) < 0.5
+    return pd.DataFrame({
+        "Timestamp": [f"2024-01-01 {i % 24:02d}:{i % 60:02d}" for i in range(n)],
+        "Record ID": [f"genus{k}_species{k}_{i:02d}" for i, k in enumerate(sp)],
+        "Genus": [f"Genus{k}" for k in sp],
+        "Species": [f"species{k}" for k in sp],
+        "Common Name": [f"common tree {k}" for k in sp],
+        "Type": np.where(sp % 2 == 0, "Deciduous", "Conifer"),
+        "Group": [f"Group {k % 12}" for k in sp],
+        "Photo Path": "",
+        "Has Leaf": flags[:, 0], "Has Bark": flags[:, 1],
+        "Has Tree": flags[:, 2], "Has Other": flags[:, 3],
+        "Scanned": flags[:, 4], "Archived": flags[:, 5],
+        "Notes": [f"note {i}" for i in range(n)],
+    })
+
+
+def check_linear(label: str, sizes: list[int], times: list[float], slack: float = 2.5):
+    per_row = [t / n for n, t in zip(sizes, times)]
+    for n, t, pr in zip(sizes, times, per_row):
+        print(f"  {label:<24} n={n:>9,}  {t * 1000:9.1f} ms  {pr * 1e6:7.2f} µs/row")
+    growth = per_row[-1] / per_row[0]
+    assert growth < slack, f"{label}: per-row cost grew {growth:.1f}x from n={sizes[0]} to n={sizes[-1]}"
+
+
+@bench
+def import_record_ids():
+    """Record ID assignment for imported rows scales linearly with batch size."""
+    from log_store import RecordIdIndex, assign_record_ids
+    index = RecordIdIndex(synthetic_log(60_000))
+    sizes = [5_000, 10_000, 20_000, 40_000]
+    times = []
+    for n in sizes:
+        inc = synthetic_log(n, seed=1).assign(**{"Record ID": ""})
+        times.append(best_of(lambda: assign_record_ids(inc, index)))
+    check_linear("assign_record_ids", sizes, times)
+
+
+@bench
+def log_search():
+    """Trigram SearchIndex vs. per-column str.contains at 100k and 1M rows."""
+    import numpy as np
+    from log_search import LOG_SEARCH_COLUMNS, SearchIndex
+    queries = ["genus12", "species7_", "common tree 19", "note 9999", "zzz"]
+
+    def scan(df, q):
+        mask = np.zeros(len(df), dtype=bool)
+        for c in LOG_SEARCH_COLUMNS:
+            mask |= df[c].astype(str).str.lower().str.contains(q, regex=False).to_numpy()
+        return np.flatnonzero(mask)
+
+    for n in (100_000, 1_000_000):
+        df = synthetic_log(n)
+        t = time.perf_counter()
+        index = SearchIndex(df, LOG_SEARCH_COLUMNS)
+        build = time.perf_counter() - t
+        t_scan = t_index = 0.0
+        for q in queries:
+            t_scan += best_of(lambda: scan(df, q), repeat=1)
+            t_index += best_of(lambda: index.search(q))
+            assert np.array_equal(scan(df, q), index.search(q)), q
+        k = len(queries)
+        print(f"  n={n:>9,}  build {build:6.2f} s   scan {t_scan / k * 1000:8.1f} ms/query"
+              f"   index {t_index / k * 1000:7.2f} ms/query   ({t_scan / max(t_index, 1e-9):,.0f}x)")
+
+
+def _compute_audit_loop(df: pd.DataFrame) -> pd.DataFrame:
+    """The per-group loop compute_audit used before it was vectorized (reference)."""
+    from audit_tab import TABLE_COLUMNS
+    from log_store import as_bool_series
+    df = df.assign(**{col: as_bool_series(df[col]) for col in
+                      ["Has Leaf", "Has Bark", "Has Tree", "Has Other", "Scanned", "Archived"]})
+    rows = []
+    for (g, s, cn, typ, grp), grp_df in df.groupby(["Genus", "Species", "Common Name", "Type", "Group"],
+                                                   dropna=False):
+        counts = {k: int(grp_df[c].sum()) for k, c in
+                  (("Leaf", "Has Leaf"), ("Bark", "Has Bark"), ("Tree", "Has Tree"), ("Other", "Has Other"),
+                   ("Scanned", "Scanned"), ("Archived", "Archived"))}
+        missing = [p for p in ("Leaf", "Bark", "Tree", "Other") if counts[p] == 0]
+        rows.append({"Genus": g or "", "Species": s or "", "Common Name": cn or "",
+                     "Type": typ or "", "Group": grp or "", "Entries": len(grp_df), **counts,
+                     "Missing": ", ".join(missing)})
+    return pd.DataFrame(rows, columns=TABLE_COLUMNS)
+
+
+@bench
+def compute_audit():
+    """Vectorized compute_audit vs. the per-group loop at 5k species / 500k rows."""
+    from audit_tab import compute_audit as vectorized
+    for n, n_species in ((50_000, 500), (500_000, 5_000)):
+        df = synthetic_log(n, n_species=n_species)
+        # thin a few species out so some parts are missing
+        df.loc[df["Genus"].str.endswith("7"), ["Has Leaf", "Has Bark"]] = False
+        t_loop = best_of(lambda: _compute_audit_loop(df), repeat=1)
+        t_vec = best_of(lambda: vectorized(df))
+        pd.testing.assert_frame_equal(vectorized(df)[0], _compute_audit_loop(df), check_dtype=False)
+        print(f"  n={n:>9,}  species={n_species:>6,}   loop {t_loop * 1000:8.1f} ms"
+              f"   grouped {t_vec * 1000:7.1f} ms   ({t_loop / t_vec:,.0f}x)")
+
+
+@bench
+def audit_delta():
+    """Audit after a one-row save: maintained SpeciesAggregates vs. full recompute (500k rows)."""
+    from audit_tab import audit_table, compute_audit
+    from log_store import SpeciesAggregates
+    df = synthetic_log(500_000, n_species=5_000)
+    agg = SpeciesAggregates(df)
+    row = synthetic_log(1, n_species=5_000, seed=3)
+
+    def delta():
+        agg.add(row)
+        audit_table(agg.frame())
+
+    t_full = best_of(lambda: compute_audit(df))
+    t_delta = best_of(delta)
+    grown = pd.concat([df] + [row] * 3, ignore_index=True)   # best_of added the row three times
+    assert not agg.mismatches(grown)
+    print(f"  full recompute {t_full * 1000:8.1f} ms   delta + audit_table {t_delta * 1000:7.1f} ms"
+          f"   ({t_full / t_delta:,.0f}x)")
+
+
+def synthetic_aliases(n: int, seed: int = 0) -> list[str]:
+    """About n aliases, two per species as load_species_aliases makes: "Genus species (common)" and "Genus species"."""
+    import random
+    rng = random.Random(seed)
+    syll = ["ac", "er", "qu", "ol", "pin", "us", "ar", "ia", "bet", "ul", "ma", "lus", "fra", "xi", "nus"]
+    word = lambda k: "".join(rng.choice(syll) for _ in range(k))
+    out = set()
+    for _ in range(n // 2):
+        sci = f"{word(3).title()} {word(3)}"
+        out.update((f"{sci} ({word(2)} {word(2)})", sci))
+    return sorted(out, key=str.lower)
+
+
+KEYSTROKE_BUDGET_MS = 10   # first dropdown page for one keystroke
+
+
+@bench
+def autocomplete():
+    """AliasIndex vs. the old double scan over ~40k aliases, per keystroke."""
+    from autocomplete import AliasIndex, AutocompleteEntry, QueryCache
+    aliases = synthetic_aliases(40_000)
+
+    def scan(text):
+        starts = [x for x in aliases if x.lower().startswith(text)]
+        return starts + [x for x in aliases if text in x.lower() and x not in starts]
+
+    t = time.perf_counter()
+    index = AliasIndex(aliases)
+    build = time.perf_counter() - t
+    queries = ["p", "pi", "pin", "pinus", "ma", "fraxi", "ol ul"]
+    def first_page(q):
+        # what AutocompleteEntry does on a keystroke with a cold cache
+        ranked = QueryCache(index).ranked(q).take(AutocompleteEntry.PAGE_SIZE)
+        if len(ranked) < AutocompleteEntry.PAGE_SIZE:
+            index.fuzzy(q, AutocompleteEntry.PAGE_SIZE - len(ranked))
+
+    t_scan = t_index = worst_page = 0.0
+    for q in queries:
+        want = scan(q)
+        t_scan += best_of(lambda: scan(q), repeat=1)
+        t_index += best_of(lambda: index.matches(q))
+        worst_page = max(worst_page, best_of(lambda: first_page(q)))
+        assert sorted(index.matches(q)) == sorted(want), q
+    k = len(queries)
+    print(f"  {len(aliases):,} aliases  build {build * 1000:.0f} ms   scan {t_scan / k * 1000:8.1f} ms/key"
+          f"   index {t_index / k * 1000:7.2f} ms/key   first page <= {worst_page * 1000:.2f} ms")
+    assert worst_page * 1000 < KEYSTROKE_BUDGET_MS, f"first page took {worst_page * 1000:.1f} ms"
+
+
+@bench
+def autocomplete_typing():
+    """A typing session with backspaces, first page per keystroke: QueryCache vs. a fresh index search."""
+    from itertools import islice
+    from autocomplete import AliasIndex, AutocompleteEntry, QueryCache
+    page = AutocompleteEntry.PAGE_SIZE
+    index = AliasIndex(synthetic_aliases(40_000))
+    words = ["pinus ma", "fraxinus", "qu"]
+    keys = []
+    for w in words:
+        keys += [w[:k] for k in range(1, len(w) + 1)]
+        keys += [w[:k] for k in range(len(w) - 1, 0, -1)]   # backspace to one letter
+        keys += [w[:k] for k in range(2, len(w) + 1)]       # and retype
+
+    def fresh():
+        for q in keys:
+            list(islice(index.iter_ranked(q), page))
+
+    def cached():
+        cache = QueryCache(index)
+        for q in keys:
+            cache.ranked(q).take(page)
+
+    cache = QueryCache(index)
+    assert all(cache.ranked(q).take(page) == list(islice(index.iter_ranked(q), page)) for q in keys)
+    cache = QueryCache(index)
+    assert all(list(cache.ranked(q)) == list(index.iter_ranked(q)) for q in keys)
+    t_fresh, t_cached = best_of(fresh), best_of(cached)
+    print(f"  {len(keys)} keystrokes   fresh {t_fresh / len(keys) * 1000:6.2f} ms/key"
+          f"   cached {t_cached / len(keys) * 1000:6.2f} ms/key   ({t_fresh / t_cached:,.1f}x)")
+
+
+@bench
+def fuzzy_resolve():
+    """Typo-tolerant AliasIndex.fuzzy() over ~40k aliases: ranked candidates per query."""
+    import random
+    from autocomplete import AliasIndex
+    aliases = synthetic_aliases(40_000)
+    index = AliasIndex(aliases)
+    rng = random.Random(1)
+    targets = rng.sample(aliases, 20)
+    typo = lambda s: "".join(c if rng.random() > 0.08 else rng.choice("aeiou") for c in s)
+    queries = [typo(t.split(" (")[0]) for t in targets]
+    hits = 0
+    t = time.perf_counter()
+    for q, want in zip(queries, targets):
+        found = [index.items[i] for _, i in index.fuzzy(q, limit=5)]
+        hits += any(f.startswith(want.split(" (")[0]) for f in found)
+    per = (time.perf_counter() - t) / len(queries)
+    print(f"  {len(aliases):,} aliases   {per * 1000:.2f} ms/query   intended species in top 5: {hits}/{len(queries)}")
+
+
+@bench
+def usage_ranking():
+    """Usage-ranked suggestions: SpeciesUsage upkeep on save, re-ranking ~40k aliases, weighted first page."""
+    import random
+    from autocomplete import AliasIndex, AutocompleteEntry, QueryCache
+    from log_store import SpeciesUsage
+    from logger_tab import usage_ranking
+    aliases = synthetic_aliases(40_000)
+    recs = {}   # one record per species, shared by its aliases as in load_species_aliases
+    for a in aliases:
+        if " (" in a:
+            genus, species = a.split(" (")[0].split(" ", 1)
+            recs[a.split(" (")[0]] = {"Genus": genus, "Species": species, "Common Name": a.partition(" (")[2][:-1]}
+    alias_to_rec = {a: recs[a.split(" (")[0]] for a in aliases if a.split(" (")[0] in recs}
+    index = AliasIndex(aliases)
+    rng = random.Random(2)
+    logged = rng.sample(sorted({(r["Genus"], r["Species"]) for r in alias_to_rec.values()}), 200)
+    picks = [rng.choice(logged) for _ in range(200_000)]
+    df = pd.DataFrame({"Genus": [g for g, _ in picks], "Species": [sp for _, sp in picks],
+                       "Timestamp": [f"2026-{1 + i % 9:02d}-{1 + i % 28:02d} 10:00" for i in range(len(picks))]})
+
+    t = time.perf_counter()
+    usage = SpeciesUsage(df)
+    build = time.perf_counter() - t
+    t_save = best_of(lambda: usage.add(df.iloc[:1]))
+    t_rank = best_of(lambda: usage_ranking(index, alias_to_rec, usage))
+    weights, pinned = usage_ranking(index, alias_to_rec, usage)
+    assert len(pinned) == 5 and all(p in alias_to_rec for p in pinned)
+    index.set_weights(weights)
+    worst_page = max(best_of(lambda: QueryCache(index).ranked(q).take(AutocompleteEntry.PAGE_SIZE))
+                     for q in ["p", "pi", "ma", "ol ul"])
+    print(f"  {len(df):,} log rows   counts build {build * 1000:.0f} ms   save delta {t_save * 1e6:.0f} µs"
+          f"   re-rank {len(aliases):,} aliases {t_rank * 1000:.0f} ms   weighted first page <= {worst_page * 1000:.2f} ms")
+    assert worst_page * 1000 < KEYSTROKE_BUDGET_MS, f"first page took {worst_page * 1000:.1f} ms"
+
+
+STARTUP_BUDGET_S = 1.5   # launch to first window, with a display
+IMPORT_BUDGET_S = 0.25   # importing main.py, when there is no display to open a window on
+
+
+@bench
+def startup():
+    """Time to first window stays under budget and pandas is not imported before it."""
+    import os
+    import subprocess
+    from startup import FIRST_WINDOW_ENV
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, **{FIRST_WINDOW_ENV: "1"})
+    t = time.perf_counter()
+    out = subprocess.run([sys.executable, "main.py"], cwd=here, env=env, capture_output=True, text=True,
+                         timeout=60).stdout
+    wall = time.perf_counter() - t
+    for line in out.splitlines():
+        if line.startswith("first-window"):
+            print(f"  first window after {float(line.split()[1]) * 1000:.0f} ms in-process,"
+                  f" {wall * 1000:.0f} ms wall (budget {STARTUP_BUDGET_S * 1000:.0f} ms)")
+            assert wall < STARTUP_BUDGET_S, f"startup took {wall:.2f} s"
+            return
+    probe = ("import sys, time; t = time.perf_counter(); import main; "
+             "print(time.perf_counter() - t, 'pandas' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", probe], cwd=here, capture_output=True, text=True,
+                         timeout=60).stdout
+    secs, pandas_loaded = out.split()
+    print(f"  no display; import main {float(secs) * 1000:.0f} ms, pandas loaded: {pandas_loaded}"
+          f" (budget {IMPORT_BUDGET_S * 1000:.0f} ms)")
+    assert pandas_loaded == "False", "main.py imports pandas before the window exists"
+    assert float(secs) < IMPORT_BUDGET_S, f"importing main took {float(secs):.2f} s"
+
+
+def main(argv: list[str]) -> int:
+    names = argv or list(BENCHES)
+    for name in names:
+        if name not in BENCHES:
+            print(f"unknown benchmark: {name} (have: {', '.join(BENCHES)})")
+            return 2
+        print(f"{name}: {BENCHES[name].__doc__}")
+        BENCHES[name]()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
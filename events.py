@@ -0,0 +1,81 @@
+# events.py — data-change bus between tabs, with refresh-when-visible
+import sys
+from tkinter import ttk
+
+# topics; payload keyword arguments are given per topic
+LOG_ROWS_ADDED = "log.rows_added"          # count
+LOG_ROWS_EDITED = "log.rows_edited"        # count
+LOG_ROWS_DELETED = "log.rows_deleted"      # count
+SPECIES_DB_RELOADED = "species_db.reloaded"   # path
+
+LOG_CHANGED = (LOG_ROWS_ADDED, LOG_ROWS_EDITED, LOG_ROWS_DELETED)
+
+
+class EventBus:
+    """
+    Minimal publish/subscribe. publish() calls subscribers synchronously, in
+    subscription order, so it must be called from the Tk thread (e.g. a
+    JobQueue on_done); a failing subscriber is reported and skipped.
+    """
+
+    def __init__(self):
+        self.subscribers: dict[str, list] = {}
+
+    def subscribe(self, topic: str, fn):
+        """fn(topic, **payload) on every publish(topic); returns an unsubscribe callable."""
+        self.subscribers.setdefault(topic, []).append(fn)
+        return lambda: self.subscribers.get(topic, []).remove(fn)
+
+    def publish(self, topic: str, **payload):
+        for fn in list(self.subscribers.get(topic, ())):
+            try:
+                fn(topic, **payload)
+            except Exception:
+                sys.excepthook(*sys.exc_info())
+
+
+class RefreshWhenVisible:
+    """
+    Dirty flag for one notebook tab. mark_dirty() refreshes straight away
+    (on idle) if the tab is showing, otherwise refresh() waits until the tab
+    is next selected, so hidden tabs do no work for changes they can't show.
+    """
+
+    def __init__(self, notebook: ttk.Notebook, tab, refresh):
+        self.notebook = notebook
+        self.tab = tab
+        self.refresh = refresh
+        self.dirty = False
+        self._idle = None
+        notebook.bind("<<NotebookTabChanged>>", lambda e: self._on_tab_changed(), add="+")
+
+    def visible(self) -> bool:
+        return str(self.notebook.select()) == str(self.tab)
+
+    def mark_dirty(self, *_args, **_payload):
+        self.dirty = True
+        if self.visible() and self._idle is None:
+            self._idle = self.tab.after_idle(self._run)
+
+    def _on_tab_changed(self):
+        if self.dirty and self.visible():
+            self._run()
+
+    def _run(self):
+        if self._idle is not None:
+            self.tab.after_cancel(self._idle)
+            self._idle = None
+        if self.dirty:
+            self.dirty = False
+            self.refresh()
+
+
+_BUS: EventBus | None = None
+
+
+def get_event_bus() -> EventBus:
+    """The bus shared by every tab."""
+    global _BUS
+    if _BUS is None:
+        _BUS = EventBus()
+    return _BUS
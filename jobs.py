@@ -0,0 +1,160 @@
+# jobs.py — background job queue: run disk/pandas work off the Tk thread
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import tkinter as tk
+
+POLL_MS = 25        # how often the Tk thread checks for finished jobs
+MAX_WORKERS = 2
+
+
+class JobCancelled(Exception):
+    """Raised by a job that noticed it was superseded; dropped silently."""
+
+
+class JobQueue:
+    """
+    Small thread pool whose results are delivered back on the Tk thread.
+
+    submit() runs fn(*args) on a worker. on_done(result) / on_error(exc) are
+    called from the Tk mainloop (via after()), never from the worker, so they
+    may touch widgets. Jobs sharing a `key` are coalesced: while one is
+    running, further submissions replace a single queued successor, and the
+    running job's result is dropped if a newer one is waiting.
+    `busy(flag)` is called with True when the first job carrying that callback
+    starts and False when the last one finishes.
+    """
+
+    def __init__(self, root: tk.Misc, max_workers: int = MAX_WORKERS):
+        self.root = root
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ifml-job")
+        self.results: queue.Queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.running: dict = {}      # key -> True while a job with that key runs
+        self.queued: dict = {}       # key -> newest (fn, args, on_done, on_error, busy) waiting
+        self.busy_counts: dict = {}  # busy callback -> outstanding jobs
+        self.outstanding = 0
+        self.polling = False
+
+    def submit(self, fn, *args, key=None, on_done=None, on_error=None, busy=None):
+        job = (fn, args, on_done, on_error, busy)
+        if busy is not None:
+            n = self.busy_counts.get(busy, 0)
+            self.busy_counts[busy] = n + 1
+            if n == 0:
+                busy(True)
+        with self.lock:
+            if key is not None and self.running.get(key):
+                superseded = self.queued.get(key)
+                self.queued[key] = job
+            else:
+                superseded = None
+                if key is not None:
+                    self.running[key] = True
+                self._start(key, job)
+        if superseded is not None:
+            self._release_busy(superseded[4])
+        self._ensure_polling()
+
+    def _start(self, key, job):
+        fn, args = job[0], job[1]
+        self.outstanding += 1
+        fut = self.pool.submit(fn, *args)
+        fut.add_done_callback(lambda f: self.results.put((key, job, f)))
+
+    def _release_busy(self, busy):
+        if busy is None:
+            return
+        n = self.busy_counts.get(busy, 0) - 1
+        if n <= 0:
+            self.busy_counts.pop(busy, None)
+            busy(False)
+        else:
+            self.busy_counts[busy] = n
+
+    def _ensure_polling(self):
+        if not self.polling:
+            self.polling = True
+            self.root.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        while True:
+            try:
+                key, job, fut = self.results.get_nowait()
+            except queue.Empty:
+                break
+            _, _, on_done, on_error, busy = job
+            with self.lock:
+                self.outstanding -= 1
+                successor = self.queued.pop(key, None) if key is not None else None
+                if successor is not None:
+                    self._start(key, successor)
+                elif key is not None:
+                    self.running.pop(key, None)
+            try:
+                if successor is not None:
+                    pass  # stale: a newer job for this key is already running
+                elif isinstance(fut.exception(), JobCancelled):
+                    pass
+                elif fut.exception() is not None:
+                    if on_error:
+                        on_error(fut.exception())
+                elif on_done:
+                    on_done(fut.result())
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+            finally:
+                self._release_busy(busy)
+        if self.outstanding:
+            self.root.after(POLL_MS, self._poll)
+        else:
+            self.polling = False
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True)
+
+
+class Debouncer:
+    """
+    Call fn only after delay_ms of quiet: each call restarts the timer, so a
+    burst of keystrokes costs a single fn() with the latest arguments.
+    """
+
+    def __init__(self, widget: tk.Misc, delay_ms: int, fn):
+        self.widget = widget
+        self.delay_ms = delay_ms
+        self.fn = fn
+        self._after = None
+
+    def __call__(self, *args):
+        self.cancel()
+        self._after = self.widget.after(self.delay_ms, lambda: self._fire(args))
+
+    def _fire(self, args):
+        self._after = None
+        self.fn(*args)
+
+    def cancel(self):
+        if self._after is not None:
+            self.widget.after_cancel(self._after)
+            self._after = None
+
+    def flush(self):
+        """Run a pending call now (e.g. on Enter)."""
+        if self._after is not None:
+            self.cancel()
+            self.fn()
+
+
+_QUEUES: dict = {}
+
+
+def get_job_queue(widget: tk.Misc) -> JobQueue:
+    """The JobQueue shared by every tab under widget's toplevel window."""
+    root = widget.winfo_toplevel()
+    q = _QUEUES.get(str(root))
+    if q is None:
+        q = _QUEUES[str(root)] = JobQueue(root)
+    return q
@@ -0,0 +1,38 @@
+# lazy_import.py — defer heavy imports (pandas, numpy) to first use
+# Modules bind `pd = lazy_module("pandas")` instead of `import pandas as pd`, so
+# starting the app (and building tabs that are never opened) never pays for pandas.
+import importlib
+import threading
+
+_LOCK = threading.Lock()
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access, so
+    `pd = lazy_module("pandas")` at the top of a file costs nothing until
+    pd.DataFrame (or anything else) is actually used. Modules that use it
+    need `from __future__ import annotations` so pd.* annotations are not
+    evaluated at import time.
+    """
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        with _LOCK:
+            if self.__dict__["_module"] is None:
+                self.__dict__["_module"] = importlib.import_module(self.__dict__["_name"])
+        return self.__dict__["_module"]
+
+    def __getattr__(self, attr):
+        return getattr(self.__dict__["_module"] or self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module {self.__dict__['_name']!r} ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    return LazyModule(name)
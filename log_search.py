@@ -0,0 +1,167 @@
+# log_search.py — substring search over log/audit frames
+from __future__ import annotations
+
+from lazy_import import lazy_module
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+LOG_SEARCH_COLUMNS = ["Genus", "Species", "Common Name", "Record ID", "Notes"]
+AUDIT_SEARCH_COLUMNS = ["Genus", "Species", "Common Name", "Group", "Type", "Missing"]
+
+
+SEP = "\x1f"   # column separator inside a row's search blob; never part of a query
+
+
+class SearchIndex:
+    """
+    Search structures for one version of a frame: a casefolded blob per row
+    (the search columns joined by SEP) and a trigram inverted index over the
+    blobs' UTF-8 bytes. Queries of three or more bytes intersect the posting
+    lists of their trigrams and verify the few survivors against the blobs;
+    shorter queries scan the single blob column.
+
+    Rows appended after the build (extend()) are kept as an unindexed tail
+    that every query scans, so a save does not force a rebuild.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: list[str]):
+        self.columns = list(columns)
+        self.blobs = self._blobs(df)
+        self._build_trigrams()
+        self.indexed = len(self.blobs)
+
+    def _blobs(self, df: pd.DataFrame) -> np.ndarray:
+        blob = None
+        for c in self.columns:
+            col = df[c].astype(str).str.casefold()
+            blob = col if blob is None else blob + SEP + col
+        return (blob if blob is not None else pd.Series([""] * len(df))).to_numpy(dtype=object)
+
+    def extend(self, rows: pd.DataFrame):
+        self.blobs = np.concatenate([self.blobs, self._blobs(rows)])
+
+    def _build_trigrams(self):
+        n = len(self.blobs)
+        enc = [b.encode("utf-8") for b in self.blobs]
+        lens = np.fromiter((len(b) + 1 for b in enc), dtype=np.int64, count=n)
+        data = np.frombuffer(SEP.encode().join(enc) + SEP.encode(), dtype=np.uint8) if n else np.zeros(0, np.uint8)
+        if len(data) < 3:
+            self.codes = np.zeros(0, np.uint32)
+            self.starts = np.zeros(1, np.int64)
+            self.rows = np.zeros(0, np.uint32)
+            return
+        sep = ord(SEP)
+        ok = (data[:-2] != sep) & (data[1:-1] != sep) & (data[2:] != sep)
+        pos = np.flatnonzero(ok)
+        code = (data[pos].astype(np.uint64) << 16) | (data[pos + 1].astype(np.uint64) << 8) | data[pos + 2]
+        row = np.repeat(np.arange(n, dtype=np.uint64), lens)[pos]
+        del ok, pos
+        key = (code << 32) | row
+        del code, row
+        key.sort()   # by trigram, then row
+        keep = np.empty(len(key), dtype=bool)
+        keep[0] = True
+        np.not_equal(key[1:], key[:-1], out=keep[1:])   # a trigram repeated within one row
+        key = key[keep]
+        codes = (key >> 32).astype(np.uint32)
+        self.rows = (key & 0xFFFFFFFF).astype(np.uint32)
+        del key
+        first = np.flatnonzero(np.concatenate([[True], codes[1:] != codes[:-1]]))
+        self.codes = codes[first]
+        self.starts = np.append(first, len(codes)).astype(np.int64)
+
+    def __len__(self):
+        return len(self.blobs)
+
+    def posting(self, code: int) -> np.ndarray:
+        i = np.searchsorted(self.codes, code)
+        if i >= len(self.codes) or self.codes[i] != code:
+            return self.rows[0:0]
+        return self.rows[self.starts[i]:self.starts[i + 1]]
+
+    def scan(self, term: str, candidates: np.ndarray | None = None) -> np.ndarray:
+        """Verify term against the blobs of candidates (all rows if None)."""
+        if candidates is None:
+            candidates = np.arange(len(self.blobs))
+        if not len(candidates):
+            return candidates
+        hit = pd.Series(self.blobs[candidates]).str.contains(term, regex=False).to_numpy()
+        return candidates[hit]
+
+    def search(self, term: str, check=None) -> np.ndarray:
+        """Sorted positions of rows whose search columns contain term (casefolded)."""
+        term = term.casefold()
+        raw = term.encode("utf-8")
+        if len(raw) < 3:
+            return self.scan(term)
+        grams = {(raw[i] << 16) | (raw[i + 1] << 8) | raw[i + 2] for i in range(len(raw) - 2)}
+        lists = sorted((self.posting(g) for g in grams), key=len)
+        cand = lists[0].astype(np.int64)
+        for lst in lists[1:]:
+            if check is not None:
+                check()
+            if not len(cand):
+                break
+            idx = np.minimum(np.searchsorted(lst, cand), len(lst) - 1)
+            cand = cand[lst[idx] == cand]
+        tail = np.arange(self.indexed, len(self.blobs))
+        return self.scan(term, np.concatenate([cand, tail]) if len(tail) else cand)
+
+
+class IncrementalFilter:
+    """
+    Case-insensitive substring filter over a fixed set of columns that
+    remembers its last match set (row positions). When the new query contains
+    the previous one (e.g. "que" -> "quer") over the same frame, only the
+    previous matches are re-checked; otherwise the query goes to the frame's
+    SearchIndex, which is built once per frame version.
+
+    The frame is identified by `token` when given (e.g. LogStore.layout, which
+    stays the same across appends), else by object identity.
+    """
+
+    def __init__(self, columns: list[str]):
+        self.columns = list(columns)
+        self._token = None
+        self._base = None
+        self._index: SearchIndex | None = None
+        self._term = None
+        self._hits: np.ndarray | None = None
+
+    def _same_frame(self, df: pd.DataFrame, token) -> bool:
+        if token is not None:
+            return token == self._token
+        return df is self._base
+
+    def index_for(self, df: pd.DataFrame, token=None) -> SearchIndex:
+        """
+        The SearchIndex for this frame, built on first use. With a token, a
+        frame that only grew since the last call (same token, more rows)
+        extends the index instead of rebuilding it.
+        """
+        index = self._index
+        if index is None or not self._same_frame(df, token) or len(index) > len(df):
+            self._index = SearchIndex(df, self.columns)
+            self._token, self._base = token, (df if token is None else None)
+            self._term, self._hits = None, None
+        elif len(index) < len(df):
+            index.extend(df.iloc[len(index):])
+            self._term, self._hits = None, None
+        return self._index
+
+    def positions(self, df: pd.DataFrame, term: str, token=None, check=None) -> np.ndarray:
+        """Positions of rows in df matching term; check() is polled during long lookups."""
+        term = (term or "").strip().casefold()
+        if not term:
+            return np.arange(len(df))
+        index = self.index_for(df, token)
+        if self._hits is not None and self._term in term:
+            hits = index.scan(term, self._hits)
+        else:
+            hits = index.search(term, check)
+        self._term, self._hits = term, hits
+        return hits
+
+    def filter(self, df: pd.DataFrame, term: str, token=None, check=None) -> pd.DataFrame:
+        return df.iloc[self.positions(df, term, token, check)]
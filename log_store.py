@@ -0,0 +1,1005 @@
+# log_store.py — pluggable storage backends for the species trait log
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from collections import Counter
+from datetime import datetime
+
+from lazy_import import lazy_module
+pd = lazy_module("pandas")
+
+from shared_config import get_log_backend, get_log_journal
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Paths & Schema
+# ──────────────────────────────────────────────────────────────────────────────
+DATA_DIR = "data"
+LOG_PATH = os.path.join(DATA_DIR, "species_trait_logs.xlsx")      # legacy log / export
+DB_PATH = os.path.join(DATA_DIR, "species_trait_logs.sqlite3")    # primary store
+
+LOG_COLUMNS = [
+    "Timestamp",
+    "Record ID",
+    "Genus", "Species", "Common Name", "Type", "Group",
+    "Photo Path",
+    "Has Leaf", "Has Bark", "Has Tree", "Has Other",
+    "Scanned", "Archived",
+    "Notes",
+]
+
+BOOL_COLUMNS = {"Has Leaf", "Has Bark", "Has Tree", "Has Other", "Scanned", "Archived"}
+FLAG_COLUMNS = [c for c in LOG_COLUMNS if c in BOOL_COLUMNS]    # BOOL_COLUMNS in log order
+SPECIES_KEY = ["Genus", "Species", "Common Name", "Type", "Group"]
+TRUE_STRINGS = {"true", "1", "yes", "y"}
+SEQ_KEY = "_seq"         # sequence number on each JournaledBackend row record
+TXN_KEY = "_txn"         # the append_chunks() call a row record belongs to
+COMMIT_KEY = "_commit"   # record closing that call; rows without one are ignored
+
+
+def as_bool_series(s: pd.Series) -> pd.Series:
+    if s.dtype == bool:
+        return s
+    return s.astype(str).str.strip().str.lower().isin(TRUE_STRINGS)
+
+
+def normalize_log_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Backfill missing columns, coerce flags to bool and text to str, reorder strictly."""
+    out = df.copy()
+    for c in LOG_COLUMNS:
+        if c not in out.columns:
+            out[c] = False if c in BOOL_COLUMNS else ""
+    out = out[LOG_COLUMNS]
+    for c in LOG_COLUMNS:
+        if c in BOOL_COLUMNS:
+            out[c] = as_bool_series(out[c].fillna(False))
+        else:
+            out[c] = out[c].fillna("").astype(str)
+    return out.reset_index(drop=True)
+
+
+def safe_slug(s: str) -> str:
+    s = (s or "").strip().lower()
+    s = re.sub(r"\s+", "_", s)
+    s = re.sub(r"[^a-z0-9_]+", "", s)
+    return s
+
+
+def _quote(col: str) -> str:
+    return '"' + col.replace('"', '""') + '"'
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Backends
+# ──────────────────────────────────────────────────────────────────────────────
+class LogBackend:
+    """Interface every log store implements. Rows are addressed by (Timestamp, Record ID)."""
+
+    def read(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def append(self, df: pd.DataFrame):
+        raise NotImplementedError
+
+    def append_chunks(self, chunks):
+        """Append a sequence of frames; backends that can do it atomically should."""
+        frames = list(chunks)
+        if frames:
+            self.append(pd.concat(frames, ignore_index=True))
+
+    def update(self, timestamp: str, record_id: str, values: dict) -> int:
+        raise NotImplementedError
+
+    def delete(self, keys: list[tuple[str, str]]) -> int:
+        raise NotImplementedError
+
+    def replace_all(self, df: pd.DataFrame):
+        raise NotImplementedError
+
+    def export_excel(self, path: str = LOG_PATH):
+        self.read().to_excel(path, index=False)
+
+    def pending(self) -> int:
+        """Rows accepted but not yet folded into the base file (journaled backends only)."""
+        return 0
+
+    def journal_seq(self) -> int:
+        """Highest JournaledBackend sequence number folded into this base, 0 if none."""
+        return 0
+
+    def append_journaled(self, df: pd.DataFrame, seq: int):
+        """append(df) and record seq as journal_seq() in the same write."""
+        raise NotImplementedError
+
+    def compact(self):
+        pass
+
+    def files(self) -> list[str]:
+        """Paths whose mtime/size change whenever the stored rows change."""
+        return []
+
+
+class ExcelBackend(LogBackend):
+    """Legacy backend: the whole log lives in one workbook and every write rewrites it."""
+
+    META_SHEET = "meta"   # key/value sheet holding journal_seq once a journal has folded into the workbook
+
+    def __init__(self, path: str = LOG_PATH):
+        self.path = path
+        self._seq: int | None = None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if not os.path.exists(path):
+            pd.DataFrame(columns=LOG_COLUMNS).to_excel(path, index=False)
+
+    def read(self) -> pd.DataFrame:
+        try:
+            df = pd.read_excel(self.path, dtype=object)
+        except Exception:
+            df = pd.DataFrame(columns=LOG_COLUMNS)
+        return normalize_log_df(df)
+
+    def append(self, df: pd.DataFrame):
+        self.replace_all(pd.concat([self.read(), normalize_log_df(df)], ignore_index=True))
+
+    def update(self, timestamp: str, record_id: str, values: dict) -> int:
+        df = self.read()
+        mask = (df["Timestamp"] == str(timestamp)) & (df["Record ID"] == str(record_id))
+        n = int(mask.sum())
+        if n:
+            for k, v in values.items():
+                df.loc[mask, k] = v
+            self.replace_all(df)
+        return n
+
+    def delete(self, keys: list[tuple[str, str]]) -> int:
+        df = self.read()
+        drop = pd.Series(False, index=df.index)
+        for ts, rid in keys:
+            drop |= (df["Timestamp"] == str(ts)) & (df["Record ID"] == str(rid))
+        n = int(drop.sum())
+        if n:
+            self.replace_all(df[~drop])
+        return n
+
+    def replace_all(self, df: pd.DataFrame):
+        self._write(df, self.journal_seq())
+
+    def journal_seq(self) -> int:
+        if self._seq is None:
+            try:
+                meta = pd.read_excel(self.path, sheet_name=self.META_SHEET, dtype=str)
+                self._seq = int(dict(zip(meta["key"], meta["value"])).get("journal_seq", 0))
+            except (ValueError, KeyError):
+                self._seq = 0   # no meta sheet: nothing journaled has been folded in
+        return self._seq
+
+    def append_journaled(self, df: pd.DataFrame, seq: int):
+        self._write(pd.concat([self.read(), normalize_log_df(df)], ignore_index=True), seq)
+
+    def _write(self, df: pd.DataFrame, seq: int):
+        with pd.ExcelWriter(self.path) as xw:
+            normalize_log_df(df).to_excel(xw, index=False)
+            if seq:
+                pd.DataFrame({"key": ["journal_seq"], "value": [str(seq)]}).to_excel(
+                    xw, sheet_name=self.META_SHEET, index=False)
+        self._seq = seq
+
+    def files(self) -> list[str]:
+        return [self.path]
+
+
+class SQLiteBackend(LogBackend):
+    """
+    Primary backend: one indexed SQLite table, so saves, edits and deletes touch
+    only the affected rows. Record ID is indexed rather than UNIQUE because
+    imported CSVs may carry duplicate IDs from older logs.
+    On first open an existing workbook at legacy_path is migrated in.
+    """
+
+    INDEXES = {
+        "ix_log_record_id": ["Record ID"],
+        "ix_log_genus_species": ["Genus", "Species"],
+        "ix_log_timestamp": ["Timestamp"],
+        "ix_log_type": ["Type"],
+        "ix_log_group": ["Group"],
+    }
+
+    def __init__(self, path: str = DB_PATH, legacy_path: str = LOG_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema()
+        self._migrate_from_excel(legacy_path)
+
+    def _ensure_schema(self):
+        cols = ", ".join(
+            _quote(c) + (" INTEGER NOT NULL DEFAULT 0" if c in BOOL_COLUMNS else " TEXT NOT NULL DEFAULT ''")
+            for c in LOG_COLUMNS
+        )
+        with self.conn:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS log ({cols})")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            for name, on in self.INDEXES.items():
+                self.conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON log ({', '.join(_quote(c) for c in on)})"
+                )
+
+    def _migrate_from_excel(self, legacy_path: str):
+        """
+        Only the database's first open migrates; the marker is written even when
+        there is no workbook, so a later export to legacy_path is never imported.
+        A database that already holds rows but no marker predates the marker
+        and is treated as opened before.
+        """
+        done = self.conn.execute("SELECT value FROM meta WHERE key = 'migrated_from'").fetchone()
+        if done:
+            return
+        has_rows = self.conn.execute("SELECT 1 FROM log LIMIT 1").fetchone() is not None
+        found = bool(legacy_path) and os.path.exists(legacy_path) and not has_rows
+        legacy = None
+        if found:
+            # read directly, not via ExcelBackend.read(): a locked or corrupt workbook must fail the
+            # open (and be retried next launch) rather than migrate as an empty log
+            try:
+                legacy = pd.read_excel(legacy_path, dtype=object)
+            except Exception as e:
+                self.conn.close()
+                raise RuntimeError(
+                    f"Could not read the log workbook {legacy_path} to move it into the database: {e}\n"
+                    "Close it in Excel (or restore a readable copy) and restart."
+                ) from e
+        with self.conn:
+            if legacy is not None:
+                self._insert(legacy)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)", (legacy_path if found else "",)
+            )
+
+    def _insert(self, df: pd.DataFrame):
+        df = normalize_log_df(df)
+        if df.empty:
+            return
+        for c in BOOL_COLUMNS:
+            df[c] = df[c].astype(int)
+        sql = "INSERT INTO log ({}) VALUES ({})".format(
+            ", ".join(_quote(c) for c in LOG_COLUMNS), ", ".join("?" for _ in LOG_COLUMNS)
+        )
+        self.conn.executemany(sql, df.itertuples(index=False, name=None))
+
+    def read(self) -> pd.DataFrame:
+        sql = "SELECT {} FROM log ORDER BY rowid".format(", ".join(_quote(c) for c in LOG_COLUMNS))
+        return normalize_log_df(pd.read_sql_query(sql, self.conn))
+
+    def append(self, df: pd.DataFrame):
+        with self.conn:
+            self._insert(df)
+
+    def append_chunks(self, chunks):
+        with self.conn:
+            for df in chunks:
+                self._insert(df)
+
+    def update(self, timestamp: str, record_id: str, values: dict) -> int:
+        values = {k: v for k, v in values.items() if k in LOG_COLUMNS}
+        if not values:
+            return 0
+        sets = ", ".join(f"{_quote(k)} = ?" for k in values)
+        params = [int(bool(v)) if k in BOOL_COLUMNS else str(v) for k, v in values.items()]
+        with self.conn:
+            cur = self.conn.execute(
+                f'UPDATE log SET {sets} WHERE "Timestamp" = ? AND "Record ID" = ?',
+                params + [str(timestamp), str(record_id)],
+            )
+        return cur.rowcount
+
+    def delete(self, keys: list[tuple[str, str]]) -> int:
+        with self.conn:
+            cur = self.conn.executemany(
+                'DELETE FROM log WHERE "Timestamp" = ? AND "Record ID" = ?',
+                [(str(ts), str(rid)) for ts, rid in keys],
+            )
+        return cur.rowcount
+
+    def replace_all(self, df: pd.DataFrame):
+        with self.conn:
+            self.conn.execute("DELETE FROM log")
+            self._insert(df)
+
+    def journal_seq(self) -> int:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'journal_seq'").fetchone()
+        return int(row[0]) if row else 0
+
+    def append_journaled(self, df: pd.DataFrame, seq: int):
+        with self.conn:
+            self._insert(df)
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('journal_seq', ?)", (str(seq),))
+
+    def files(self) -> list[str]:
+        return [self.path, self.path + "-wal"]
+
+
+class JournaledBackend(LogBackend):
+    """
+    Append-only JSON-lines journal in front of a base backend. New rows are
+    appended to the journal (O(1) per save); reads merge base + journal; edits,
+    deletes and compact() first fold the journal into the base.
+    Every record carries a sequence number, and the base stores the highest
+    one it holds in the same write as the rows. Compaction renames the journal
+    to *.compacting before writing the base; until that succeeds the rows are
+    still read from there, and a crash or failed write (e.g. the workbook is
+    open in Excel) is folded in on the next open or compact() by skipping
+    records the base already has. Each append_chunks() call ends with a
+    commit record; rows of a call that never committed (a crash mid-import)
+    are ignored, and one that raises is truncated away.
+    """
+
+    def __init__(self, base: LogBackend, path: str | None = None):
+        self.base = base
+        self.path = path or os.path.splitext(base.path)[0] + ".journal.jsonl"
+        self.compacting_path = self.path + ".compacting"
+        self.lock = threading.RLock()
+        self._end_torn_line()
+        self._pending = len(self._read_lines(self.compacting_path)) + len(self._read_lines(self.path))
+        # numbers of uncommitted rows are never reused, so their transaction can't be committed later
+        records = self._read_lines(self.compacting_path, True) + self._read_lines(self.path, True)
+        self._seq = max([base.journal_seq()] + [r.get(SEQ_KEY, 0) for r in records])
+        try:
+            self._recover(legacy=True)
+        except OSError:
+            pass   # base not writable right now; the rows stay readable and compact() retries
+
+    def _end_torn_line(self):
+        """Terminate a torn final line so the next append starts a record of its own."""
+        if not os.path.exists(self.path) or not os.path.getsize(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    @staticmethod
+    def _read_lines(path: str, uncommitted: bool = False) -> list[dict]:
+        """
+        Row records of committed appends (records without TXN_KEY predate commit
+        records); with uncommitted, every row record.
+        """
+        if not os.path.exists(path):
+            return []
+        rows, committed = [], set()
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn final line from an interrupted write
+                if COMMIT_KEY in rec:
+                    committed.add(rec[COMMIT_KEY])
+                else:
+                    rows.append(rec)
+        if uncommitted:
+            return rows
+        return [r for r in rows if r.get(TXN_KEY, -1) in committed or TXN_KEY not in r]
+
+    def _recover(self, legacy: bool = False):
+        """
+        Fold *.compacting into the base, skipping records at or below the base's
+        sequence number. Unnumbered records predate numbering; with legacy they
+        are matched on (Timestamp, Record ID) instead, as those journals were.
+        """
+        with self.lock:
+            records = self._read_lines(self.compacting_path)
+            folded = self.base.journal_seq()
+            todo = [r for r in records if r.get(SEQ_KEY, folded + 1) > folded]
+            if legacy and any(SEQ_KEY not in r for r in todo):
+                base = self.base.read()
+                have = set(zip(base["Timestamp"], base["Record ID"]))
+                todo = [r for r in todo if SEQ_KEY in r or (r.get("Timestamp"), r.get("Record ID")) not in have]
+            if todo:
+                seq = max([folded] + [r.get(SEQ_KEY, 0) for r in todo])
+                self.base.append_journaled(pd.DataFrame(todo), seq)
+            if os.path.exists(self.compacting_path):
+                os.remove(self.compacting_path)
+            self._pending = len(self._read_lines(self.path))
+
+    def read(self) -> pd.DataFrame:
+        with self.lock:
+            df = self.base.read()
+            rows = self._read_lines(self.compacting_path) + self._read_lines(self.path)
+        if not rows:
+            return df
+        return pd.concat([df, normalize_log_df(pd.DataFrame(rows))], ignore_index=True)
+
+    def append(self, df: pd.DataFrame):
+        self.append_chunks([df])
+
+    def append_chunks(self, chunks):
+        """All chunks or none: rows count only once the closing commit record is written."""
+        with self.lock:
+            seq, pending = self._seq, self._pending
+            txn = seq + 1
+            with open(self.path, "a", encoding="utf-8") as f:
+                start = f.tell()
+                try:
+                    for df in chunks:
+                        df = normalize_log_df(df)
+                        lines = []
+                        for rec in df.to_dict(orient="records"):
+                            self._seq += 1
+                            rec[SEQ_KEY] = self._seq
+                            rec[TXN_KEY] = txn
+                            lines.append(json.dumps(rec, ensure_ascii=False) + "\n")
+                        f.write("".join(lines))
+                        self._pending += len(df)
+                    f.write(json.dumps({COMMIT_KEY: txn}) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                except BaseException:
+                    f.truncate(start)
+                    self._seq, self._pending = seq, pending
+                    raise
+
+    def update(self, timestamp: str, record_id: str, values: dict) -> int:
+        with self.lock:
+            self.compact()
+            return self.base.update(timestamp, record_id, values)
+
+    def delete(self, keys: list[tuple[str, str]]) -> int:
+        with self.lock:
+            self.compact()
+            return self.base.delete(keys)
+
+    def replace_all(self, df: pd.DataFrame):
+        with self.lock:
+            self.base.replace_all(df)
+            for path in (self.compacting_path, self.path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._pending = 0
+
+    def pending(self) -> int:
+        return self._pending
+
+    def compact(self):
+        with self.lock:
+            if os.path.exists(self.compacting_path):
+                self._recover()   # an earlier compaction failed; never rename over its rows
+            if not os.path.exists(self.path):
+                return
+            os.replace(self.path, self.compacting_path)
+            self._recover()   # on failure *.compacting is kept for the next attempt
+
+    def files(self) -> list[str]:
+        return self.base.files() + [self.compacting_path, self.path]
+
+
+class RecordIdIndex:
+    """
+    (genus, species) -> Record ID sequence numbers, plus a multiset of every
+    Record ID in the log. Built once from the log, then kept current by
+    LogStore, so allocating the next ID and checking for collisions are O(1).
+    """
+
+    SEQ_RE = re.compile(r"_(\d+)$")
+
+    def __init__(self, df: pd.DataFrame | None = None):
+        self.ids: Counter = Counter()
+        self.seqs: dict[tuple[str, str], Counter] = {}
+        self.max_seq: dict[tuple[str, str], int] = {}
+        if df is not None:
+            self.add(df)
+
+    @staticmethod
+    def key(genus, species) -> tuple[str, str]:
+        return str(genus).strip(), str(species).strip()
+
+    def _entries(self, df: pd.DataFrame):
+        for g, sp, rid in zip(df["Genus"], df["Species"], df["Record ID"]):
+            rid = str(rid)
+            m = self.SEQ_RE.search(rid)
+            yield self.key(g, sp), rid, int(m.group(1)) if m else None
+
+    def add(self, df: pd.DataFrame):
+        for key, rid, seq in self._entries(df):
+            self.ids[rid] += 1
+            if seq is not None:
+                self.seqs.setdefault(key, Counter())[seq] += 1
+                if seq > self.max_seq.get(key, 0):
+                    self.max_seq[key] = seq
+
+    def remove(self, df: pd.DataFrame):
+        for key, rid, seq in self._entries(df):
+            self.ids[rid] -= 1
+            if self.ids[rid] <= 0:
+                del self.ids[rid]
+            if seq is None or key not in self.seqs:
+                continue
+            seqs = self.seqs[key]
+            seqs[seq] -= 1
+            if seqs[seq] <= 0:
+                del seqs[seq]
+                if seq == self.max_seq.get(key):
+                    self.max_seq[key] = max(seqs, default=0)
+
+    def last_seq(self, genus, species) -> int:
+        return self.max_seq.get(self.key(genus, species), 0)
+
+    def next_id(self, genus, species) -> str:
+        """Return next id like genus_species_01 for that species."""
+        g, sp = self.key(genus, species)
+        return f"{safe_slug(g)}_{safe_slug(sp)}_{(self.last_seq(g, sp) + 1):02d}"
+
+    def __contains__(self, record_id) -> bool:
+        return str(record_id) in self.ids
+
+    def copy(self) -> "RecordIdIndex":
+        out = RecordIdIndex()
+        out.ids = Counter(self.ids)
+        out.seqs = {k: Counter(v) for k, v in self.seqs.items()}
+        out.max_seq = dict(self.max_seq)
+        return out
+
+
+def assign_record_ids(inc: pd.DataFrame, index: RecordIdIndex) -> pd.DataFrame:
+    """
+    Fill blank Record IDs for a whole batch at once: number each species'
+    rows with a group-wise cumulative count, offset by the highest sequence
+    already used in the log (or by explicit IDs in the same batch).
+    """
+    rid = inc["Record ID"].fillna("").astype(str).str.strip()
+    missing = rid == ""
+    if not missing.any():
+        return inc
+    inc = inc.copy()
+    keys = pd.DataFrame({
+        "g": inc["Genus"].fillna("").astype(str).str.strip(),
+        "s": inc["Species"].fillna("").astype(str).str.strip(),
+    })
+
+    # sequence numbers the batch brings with it
+    given = keys[~missing].assign(seq=rid[~missing].str.extract(r"_(\d+)$", expand=False))
+    given = given.dropna(subset=["seq"]).astype({"seq": int}).groupby(["g", "s"])["seq"].max()
+
+    todo = keys[missing]
+    groups = todo.drop_duplicates().reset_index(drop=True)
+    groups["offset"] = [
+        max(index.last_seq(g, sp), int(given.get((g, sp), 0)))
+        for g, sp in zip(groups["g"], groups["s"])
+    ]
+    groups["prefix"] = [f"{safe_slug(g)}_{safe_slug(sp)}_" for g, sp in zip(groups["g"], groups["s"])]
+
+    seq = todo.groupby(["g", "s"], sort=False).cumcount() + 1
+    meta = todo.merge(groups, on=["g", "s"], how="left")
+    meta.index = todo.index
+    inc.loc[missing, "Record ID"] = meta["prefix"] + (meta["offset"] + seq).astype(str).str.zfill(2)
+    return inc
+
+
+class SpeciesAggregates:
+    """
+    Entries and per-flag counts for every species key (SPECIES_KEY). Built
+    once from the log, then kept current by LogStore from the rows each
+    write adds and removes, so the audit never has to regroup the whole log.
+    """
+
+    COLUMNS = ["Entries"] + FLAG_COLUMNS
+
+    def __init__(self, df: pd.DataFrame | None = None):
+        self.counts: dict[tuple, list[int]] = {}
+        if df is not None:
+            self.add(df)
+
+    @classmethod
+    def sums(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """Grouped counts of df, one row per species key (sorted), in COLUMNS."""
+        flags = df.assign(**{c: as_bool_series(df[c]) for c in FLAG_COLUMNS})
+        grouped = flags.groupby(SPECIES_KEY, dropna=False)[FLAG_COLUMNS]
+        out = grouped.sum().astype(int)
+        out.insert(0, "Entries", grouped.size())
+        return out
+
+    def _apply(self, df: pd.DataFrame, sign: int):
+        if df.empty:
+            return
+        sums = self.sums(df)
+        for key, vals in zip(sums.index, sums.to_numpy().tolist()):
+            acc = self.counts.get(key)
+            if acc is None:
+                acc = self.counts[key] = [0] * len(vals)
+            for i, v in enumerate(vals):
+                acc[i] += sign * v
+            if acc[0] <= 0:
+                del self.counts[key]
+
+    def add(self, df: pd.DataFrame):
+        self._apply(df, 1)
+
+    def remove(self, df: pd.DataFrame):
+        self._apply(df, -1)
+
+    def frame(self) -> pd.DataFrame:
+        """SPECIES_KEY + COLUMNS, one row per species key, sorted like a groupby."""
+        if not self.counts:
+            return pd.DataFrame(columns=SPECIES_KEY + self.COLUMNS)
+        keys = sorted(self.counts)
+        out = pd.DataFrame(keys, columns=SPECIES_KEY)
+        vals = pd.DataFrame([self.counts[k] for k in keys], columns=self.COLUMNS)
+        return pd.concat([out, vals], axis=1)
+
+    def mismatches(self, df: pd.DataFrame) -> list[str]:
+        """Differences from a full recompute over df (empty when consistent)."""
+        fresh = SpeciesAggregates(df).counts
+        out = []
+        for key in sorted(set(fresh) | set(self.counts)):
+            have, want = self.counts.get(key), fresh.get(key)
+            if have != want:
+                out.append(f"{' / '.join(map(str, key))}: have {have}, expected {want}")
+        return out
+
+    def copy(self) -> "SpeciesAggregates":
+        out = SpeciesAggregates()
+        out.counts = {k: list(v) for k, v in self.counts.items()}
+        return out
+
+
+class SpeciesUsage:
+    """
+    How often and how recently each (genus, species) was logged, for ranking
+    species suggestions. Kept current by LogStore like RecordIdIndex. `last`
+    holds the latest timestamp as ISO text, so it compares chronologically;
+    timestamps in no known format count towards usage but not recency. On
+    removal `last` is only dropped with the species' final row, so recency
+    can lag behind deletes of the newest entries.
+    """
+
+    HALF_LIFE_DAYS = 30.0
+    TIME_FORMATS = ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d",
+                    "%m/%d/%Y %H:%M", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y")
+    ISO_RE = re.compile(r"\d{4}-\d{2}-\d{2}( \d{2}:\d{2}(:\d{2})?)?$")
+
+    def __init__(self, df: pd.DataFrame | None = None):
+        self.counts: Counter = Counter()
+        self.last: dict[tuple[str, str], str] = {}
+        if df is not None:
+            self.add(df)
+
+    @staticmethod
+    def key(genus, species) -> tuple[str, str]:
+        return str(genus).strip().casefold(), str(species).strip().casefold()
+
+    def add(self, df: pd.DataFrame):
+        for g, sp, ts in zip(df["Genus"], df["Species"], df["Timestamp"]):
+            k = self.key(g, sp)
+            self.counts[k] += 1
+            ts = self._iso(str(ts).strip())
+            if ts is not None and ts > self.last.get(k, ""):
+                self.last[k] = ts
+
+    def remove(self, df: pd.DataFrame):
+        for g, sp in zip(df["Genus"], df["Species"]):
+            k = self.key(g, sp)
+            self.counts[k] -= 1
+            if self.counts[k] <= 0:
+                del self.counts[k]
+                self.last.pop(k, None)
+
+    @classmethod
+    def _iso(cls, ts: str) -> str | None:
+        """ts as sortable ISO text (the app's own format passes through), None if unparseable."""
+        if cls.ISO_RE.match(ts):
+            return ts
+        when = cls._parse(ts)
+        return when.strftime("%Y-%m-%d %H:%M:%S") if when else None
+
+    @classmethod
+    def _parse(cls, ts: str) -> datetime | None:
+        for fmt in cls.TIME_FORMATS:
+            try:
+                return datetime.strptime(ts, fmt)
+            except ValueError:
+                pass
+        return None
+
+    def scores(self, now: datetime | None = None) -> dict[tuple[str, str], float]:
+        """Entry count decayed by the age of the latest entry (halving every HALF_LIFE_DAYS)."""
+        now = now or datetime.now()
+        out = {}
+        for k, n in self.counts.items():
+            when = self._parse(self.last.get(k, ""))
+            age = max((now - when).total_seconds() / 86400, 0.0) if when else 10 * self.HALF_LIFE_DAYS
+            out[k] = n * 0.5 ** (age / self.HALF_LIFE_DAYS)
+        return out
+
+    def most_recent(self, n: int) -> list[tuple[str, str]]:
+        return sorted(self.last, key=self.last.get, reverse=True)[:n]
+
+    def copy(self) -> "SpeciesUsage":
+        out = SpeciesUsage()
+        out.counts = Counter(self.counts)
+        out.last = dict(self.last)
+        return out
+
+
+class LogStore:
+    """
+    Process-wide in-memory copy of the log. The parsed DataFrame is kept until
+    the backing files' mtime/size change; the app's own writes go through here
+    and patch the cached frame instead of re-reading it. `version` increases on
+    every change so derived data (search indexes, audit tables) can key on it;
+    `layout` increases only when existing rows change or move, so data derived
+    per row position survives appends.
+    """
+
+    def __init__(self, backend: LogBackend):
+        self.backend = backend
+        self.lock = threading.RLock()
+        self.version = 0
+        self.layout = 0
+        self._df: pd.DataFrame | None = None
+        self._sig = None
+        self._worker: threading.Thread | None = None
+        self._derived: dict[str, list] = {}   # name -> [index, version it matches]
+
+    def _signature(self):
+        sig = []
+        for p in self.backend.files():
+            try:
+                st = os.stat(p)
+                sig.append((p, st.st_mtime_ns, st.st_size))
+            except OSError:
+                sig.append((p, None, None))
+        return tuple(sig)
+
+    def _changed(self, added: pd.DataFrame | None = None, removed: pd.DataFrame | None = None):
+        """Record our own write and carry derived indexes across it by delta."""
+        fresh = [entry for entry in self._derived.values() if entry[1] == self.version]
+        self._sig = self._signature()
+        self.version += 1
+        if added is not None and removed is not None:
+            for entry in fresh:
+                entry[0].remove(removed)
+                entry[0].add(added)
+                entry[1] = self.version
+
+    def _derived_index(self, name: str, build):
+        """The derived index `name` for the current log, built with build(df) when stale."""
+        with self.lock:
+            df = self.frame()
+            entry = self._derived.get(name)
+            if entry is None or entry[1] != self.version:
+                entry = self._derived[name] = [build(df), self.version]
+            return entry[0]
+
+    def record_ids(self) -> RecordIdIndex:
+        return self._derived_index("record_ids", RecordIdIndex)
+
+    def species_counts(self) -> tuple[int, pd.DataFrame]:
+        """(version, SpeciesAggregates.frame()) read together."""
+        with self.lock:
+            agg = self._derived_index("species", SpeciesAggregates)
+            return self.version, agg.frame()
+
+    def species_usage(self) -> SpeciesUsage:
+        """A copy of the maintained per-species usage counts."""
+        with self.lock:
+            return self._derived_index("usage", SpeciesUsage).copy()
+
+    def check_species_counts(self) -> list[str]:
+        """Verify the maintained species aggregates against a full recompute."""
+        with self.lock:
+            return self._derived_index("species", SpeciesAggregates).mismatches(self.frame())
+
+    def frame(self) -> pd.DataFrame:
+        """Current log as a read-only view; copy before mutating."""
+        with self.lock:
+            sig = self._signature()
+            if self._df is None or sig != self._sig:
+                self._df = self.backend.read()
+                if sig != self._sig:   # not just our own append_chunks() being re-read
+                    self.version += 1
+                    self.layout += 1
+                self._sig = sig
+            return self._df.copy(deep=False)
+
+    def snapshot(self) -> tuple[int, int, pd.DataFrame]:
+        """(version, layout, frame) read together, for caches keyed on them."""
+        with self.lock:
+            df = self.frame()
+            return self.version, self.layout, df
+
+    def append(self, df: pd.DataFrame):
+        df = normalize_log_df(df)
+        with self.lock:
+            cached = self.frame()
+            self.backend.append(df)
+            self._df = pd.concat([cached, df], ignore_index=True)
+            self._changed(added=df, removed=df.iloc[0:0])
+
+    def update(self, timestamp: str, record_id: str, values: dict) -> int:
+        with self.lock:
+            cached = self.frame().copy()
+            n = self.backend.update(timestamp, record_id, values)
+            if n:
+                mask = (cached["Timestamp"] == str(timestamp)) & (cached["Record ID"] == str(record_id))
+                before = cached[mask]
+                for k, v in values.items():
+                    if k in LOG_COLUMNS:
+                        cached.loc[mask, k] = bool(v) if k in BOOL_COLUMNS else str(v)
+                self._df = cached
+                self.layout += 1
+                self._changed(added=cached[mask], removed=before)
+            return n
+
+    def delete(self, keys: list[tuple[str, str]]) -> int:
+        with self.lock:
+            cached = self.frame()
+            n = self.backend.delete(keys)
+            if n:
+                gone = {(str(ts), str(rid)) for ts, rid in keys}
+                drop = pd.Series(
+                    [k in gone for k in zip(cached["Timestamp"], cached["Record ID"])],
+                    index=cached.index,
+                )
+                self._df = cached[~drop].reset_index(drop=True)
+                self.layout += 1
+                self._changed(added=cached.iloc[0:0], removed=cached[drop])
+            return n
+
+    def replace_all(self, df: pd.DataFrame):
+        df = normalize_log_df(df)
+        with self.lock:
+            self.backend.replace_all(df)
+            self._df = df
+            self.layout += 1
+            self._changed()
+
+    def append_chunks(self, chunks):
+        """
+        Bulk append without holding the batch in memory; the cached frame is
+        dropped and re-read on next use rather than grown chunk by chunk.
+        Derived indexes are carried over on copies, swapped in once the
+        backend has committed the whole batch.
+        """
+        with self.lock:
+            self.frame()
+            staged = {name: entry[0].copy() for name, entry in self._derived.items()
+                      if entry[1] == self.version}
+
+            def normalized():
+                for c in chunks:
+                    c = normalize_log_df(c)
+                    for index in staged.values():
+                        index.add(c)
+                    yield c
+
+            self.backend.append_chunks(normalized())
+            self._df = None
+            self.layout += 1
+            self._changed()
+            for name, index in staged.items():
+                self._derived[name] = [index, self.version]
+
+    def export_excel(self, path: str = LOG_PATH):
+        self.frame().to_excel(path, index=False)
+
+    def compact(self):
+        """Fold any journal into the base file; the rows themselves don't change."""
+        with self.lock:
+            if not self.backend.pending():
+                return
+            self.backend.compact()
+            self._sig = self._signature()
+
+    def compact_in_background(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        if not self.backend.pending():
+            return
+        self._worker = threading.Thread(target=self.compact, name="log-compaction", daemon=True)
+        self._worker.start()
+
+
+class ImportBatch:
+    """
+    Staged bulk import. Chunks are spooled to a temporary CSV in the data
+    folder, so memory stays bounded by the chunk size. Nothing reaches the
+    log until commit(), which numbers blank Record IDs against the live
+    index under the store lock, so rows saved while the import ran can't
+    collide with it; rollback() just discards the spool.
+    """
+
+    def __init__(self, store: LogStore):
+        self.store = store
+        self.rows = 0
+        os.makedirs(DATA_DIR, exist_ok=True)
+        fd, self.spool_path = tempfile.mkstemp(prefix="import-", suffix=".spool.csv", dir=DATA_DIR)
+        os.close(fd)
+
+    def add(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        chunk = normalize_log_df(chunk)
+        chunk.to_csv(self.spool_path, mode="a", header=self.rows == 0, index=False)
+        self.rows += len(chunk)
+        return chunk
+
+    def _spooled(self, chunk_rows: int):
+        if not self.rows:
+            return
+        for chunk in pd.read_csv(self.spool_path, dtype=str, keep_default_na=False, chunksize=chunk_rows):
+            yield chunk
+
+    def _numbered(self, chunks, index: RecordIdIndex):
+        for chunk in chunks:
+            chunk = assign_record_ids(chunk, index)
+            index.add(chunk)
+            yield chunk
+
+    def commit(self, chunk_rows: int = 20_000):
+        try:
+            with self.store.lock:
+                index = self.store.record_ids().copy()
+                self.store.append_chunks(self._numbered(self._spooled(chunk_rows), index))
+        finally:
+            self._discard()
+
+    def rollback(self):
+        self._discard()
+
+    def _discard(self):
+        try:
+            os.remove(self.spool_path)
+        except OSError:
+            pass
+
+
+BACKENDS = {
+    "sqlite": SQLiteBackend,
+    "xlsx": ExcelBackend,
+}
+
+_STORE: LogStore | None = None
+_STORE_LOCK = threading.Lock()
+
+
+def open_backend() -> LogBackend:
+    """
+    Log backend chosen by the 'log_backend' config key (default
+    sqlite). The xlsx backend is journaled by default since every base write
+    rewrites the workbook; SQLite already commits single rows cheaply.
+    """
+    kind = get_log_backend("sqlite")
+    backend = BACKENDS.get(kind, SQLiteBackend)()
+    if get_log_journal(kind == "xlsx"):
+        backend = JournaledBackend(backend)
+    return backend
+
+
+def get_log_store() -> LogStore:
+    """The single LogStore shared by every tab; the first call opens (and may migrate) the log."""
+    global _STORE
+    with _STORE_LOCK:   # first called from worker threads, possibly several at once
+        if _STORE is None:
+            _STORE = LogStore(open_backend())
+    return _STORE
+
+
+@atexit.register
+def _compact_on_exit():
+    if _STORE is not None:
+        try:
+            _STORE.compact()
+        except Exception:
+            pass
+
+
+def read_log_df() -> pd.DataFrame:
+    return get_log_store().frame()
+
+
+def write_log_df(df: pd.DataFrame):
+    get_log_store().replace_all(df)
@@ -1,9 +1,12 @@
 # logger_tab.py — streamlined logger with split layout, filters, edit/delete, import/export
+from __future__ import annotations
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
+from lazy_import import lazy_module
+pd = lazy_module("pandas")
 import os
-import re
+import time
 from datetime import datetime
 from shared_config import get_db_path
 
@@ -30,73 +33,86 @@ def _read_any(path: str) -> pd.DataFrame:
     return pd.read_csv(path, dtype=str)
 
 
-from autocomplete import AutocompleteEntry
+from autocomplete import AliasIndex, AutocompleteEntry, weight_rank
 from utils import style_row_tags_for_treeview, register_theme_listener  # theme hooks
+from jobs import Debouncer, JobCancelled, get_job_queue
+from shared_config import get_search_debounce_ms
+from virtual_tree import VirtualTreeview
+from log_search import IncrementalFilter, LOG_SEARCH_COLUMNS
+from events import (
+    LOG_CHANGED, LOG_ROWS_ADDED, LOG_ROWS_DELETED, LOG_ROWS_EDITED, SPECIES_DB_RELOADED,
+    RefreshWhenVisible, get_event_bus,
+)
+from log_store import (
+    LOG_COLUMNS, BOOL_COLUMNS,
+    ImportBatch, SpeciesUsage, get_log_store, read_log_df,
+)
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Paths & Schema
+# Paths & Schema (the log itself lives in log_store)
 # ──────────────────────────────────────────────────────────────────────────────
-LOG_PATH = "data/species_trait_logs.xlsx"   # photo/scan log
 SPECIES_PATH = "data/species_list.xlsx"     # species reference
-
-LOG_COLUMNS = [
-    "Timestamp",
-    "Record ID",
-    "Genus", "Species", "Common Name", "Type", "Group",
-    "Photo Path",
-    "Has Leaf", "Has Bark", "Has Tree", "Has Other",
-    "Scanned", "Archived",
-    "Notes",
-]
-
-BOOL_COLUMNS = {"Has Leaf", "Has Bark", "Has Tree", "Has Other", "Scanned", "Archived"}
+COMPACT_IDLE_MS = 30_000                    # fold the log journal after this much quiet
+IMPORT_CHUNK_ROWS = 5_000                   # rows parsed per step of a streaming import
+MRU_PINNED = 5                              # recently logged species pinned atop suggestions
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Utilities
 # ──────────────────────────────────────────────────────────────────────────────
 def ensure_dir_structure():
-    os.makedirs("data", exist_ok=True)
-    if not os.path.exists(LOG_PATH):
-        pd.DataFrame(columns=LOG_COLUMNS).to_excel(LOG_PATH, index=False)
-
-def read_log_df() -> pd.DataFrame:
-    ensure_dir_structure()
-    try:
-        df = pd.read_excel(LOG_PATH)
-    except Exception:
-        df = pd.DataFrame(columns=LOG_COLUMNS)
-    # Backfill any missing columns and reorder strictly
-    for c in LOG_COLUMNS:
-        if c not in df.columns:
-            df[c] = False if c in BOOL_COLUMNS else ""
-    return df[LOG_COLUMNS]
-
-def write_log_df(df: pd.DataFrame):
-    out = df.copy()
-    for c in LOG_COLUMNS:
-        if c not in out.columns:
-            out[c] = False if c in BOOL_COLUMNS else ""
-    out = out[LOG_COLUMNS]
-    out.to_excel(LOG_PATH, index=False)
-
-def safe_slug(s: str) -> str:
-    s = (s or "").strip().lower()
-    s = re.sub(r"\s+", "_", s)
-    s = re.sub(r"[^a-z0-9_]+", "", s)
-    return s
+    get_log_store()
 
 def next_record_id(genus: str, species: str) -> str:
     """Return next id like genus_species_01 for that species."""
-    df = read_log_df()
-    g = str(genus).strip()
-    sp = str(species).strip()
-    subset = df[(df["Genus"] == g) & (df["Species"] == sp)]
-    n = 0
-    for rid in subset.get("Record ID", pd.Series(dtype=str)).dropna().astype(str):
-        m = re.search(r"_(\d+)$", rid)
-        if m:
-            n = max(n, int(m.group(1)))
-    return f"{safe_slug(g)}_{safe_slug(sp)}_{(n + 1):02d}"
+    return get_log_store().record_ids().next_id(genus, species)
+
+
+def save_log_row(row: dict) -> str:
+    """Allocate the Record ID and append one row atomically; safe to call off the Tk thread."""
+    store = get_log_store()
+    with store.lock:
+        ids = store.record_ids()
+        row = dict(row, **{"Record ID": ids.next_id(row["Genus"], row["Species"])})
+        # prevent duplicate Record ID collision (rare, but safe)
+        if row["Record ID"] in ids:
+            raise ValueError("Record ID collision; please try again.")
+        store.append(pd.DataFrame([row]))
+    return row["Record ID"]
+
+
+def filter_log(df: pd.DataFrame, tsel: str, gsel: str, ssel: str,
+               only_missing: bool, term: str, is_stale=None,
+               search: IncrementalFilter | None = None, version=None) -> tuple[pd.DataFrame, list[str], list[str]]:
+    """Apply the Logger's filters (search first, reusing `search`); returns (rows, type options, group options)."""
+    def check():
+        if is_stale is not None and is_stale():
+            raise JobCancelled()
+
+    types = sorted([t for t in df["Type"].dropna().astype(str).unique().tolist() if t.strip()])
+    groups = sorted([g for g in df["Group"].dropna().astype(str).unique().tolist() if g.strip()])
+
+    # the store hands out a read-only view with flags already normalized to bool
+    search = search or IncrementalFilter(LOG_SEARCH_COLUMNS)
+    out = search.filter(df, term, token=version, check=check)
+
+    if tsel and tsel != "All":
+        out = out[out["Type"].astype(str) == tsel]
+    if gsel and gsel != "All":
+        out = out[out["Group"].astype(str) == gsel]
+
+    if ssel == "Scanned":
+        out = out[out["Scanned"]]
+    elif ssel == "Unscanned":
+        out = out[~out["Scanned"]]
+    elif ssel == "Archived":
+        out = out[out["Archived"]]
+    elif ssel == "Unarchived":
+        out = out[~out["Archived"]]
+
+    if only_missing:
+        out = out[~(out["Has Leaf"] & out["Has Bark"] & out["Has Tree"] & out["Has Other"])]
+
+    return out, types, groups
 
 
 # Reference species list for autofill during CSV import.  Resolve the CSV
@@ -129,29 +145,66 @@ def load_reference_db(path: str = REFERENCE_CSV) -> pd.DataFrame:
         return pd.DataFrame(columns=["Common Name", "Genus", "Species"])
 
 
+def autofill_species_report(df: pd.DataFrame, ref: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+    """Fill missing Genus/Species from Common Name via the reference; returns (frame, filled/ambiguous/unresolved counts)."""
+    out = df.copy()
+    genus = out["Genus"].fillna("").astype(str).str.strip()
+    species = out["Species"].fillna("").astype(str).str.strip()
+    need = (genus == "") | (species == "")
+    report = {"filled": 0, "ambiguous": 0, "unresolved": int(need.sum())}
+    if ref.empty or not need.any():
+        return out, report
+
+    r = pd.DataFrame({
+        "key": ref["Common Name"].astype(str).str.strip().str.lower(),
+        "Genus": ref["Genus"].astype(str).str.strip(),
+        "Species": ref["Species"].astype(str).str.strip(),
+    })
+    r = r[r["key"] != ""].drop_duplicates()
+    per_key = r["key"].value_counts()
+    unique = r[r["key"].map(per_key) == 1].set_index("key")
+
+    key = out["Common Name"].fillna("").astype(str).str.strip().str.lower()
+    hit = pd.DataFrame({"key": key[need]}).join(unique, on="key")
+    found = hit["Genus"].notna()
+    fill_g = found & (genus[need] == "")
+    fill_s = found & (species[need] == "")
+    out.loc[fill_g[fill_g].index, "Genus"] = hit.loc[fill_g, "Genus"]
+    out.loc[fill_s[fill_s].index, "Species"] = hit.loc[fill_s, "Species"]
+
+    ambiguous = key[need].isin(per_key.index[per_key > 1])
+    report["filled"] = int(found.sum())
+    report["ambiguous"] = int(ambiguous.sum())
+    report["unresolved"] = int((~found & ~ambiguous).sum())
+    return out, report
+
+
 def autofill_species(df: pd.DataFrame, ref: pd.DataFrame) -> pd.DataFrame:
     """Fill missing Genus/Species using Common Name via reference table."""
-    if ref.empty:
-        return df
-    lookup = {
-        str(r.get("Common Name", "")).strip().lower(): (
-            str(r.get("Genus", "")).strip(),
-            str(r.get("Species", "")).strip(),
-        )
-        for _, r in ref.iterrows()
-    }
-    for idx, row in df.iterrows():
-        genus = str(row.get("Genus", "")).strip()
-        species = str(row.get("Species", "")).strip()
-        if genus and species:
-            continue
-        common = str(row.get("Common Name", "")).strip().lower()
-        g, s = lookup.get(common, (genus, species))
-        if not genus:
-            df.at[idx, "Genus"] = g
-        if not species:
-            df.at[idx, "Species"] = s
-    return df
+    return autofill_species_report(df, ref)[0]
+
+
+def normalize_import_chunk(inc: pd.DataFrame) -> pd.DataFrame:
+    """Backfill log columns, coerce BOOL_COLUMNS and reorder an incoming CSV chunk."""
+    inc = inc.fillna("")
+    for c in LOG_COLUMNS:
+        if c not in inc.columns:
+            inc[c] = False if c in BOOL_COLUMNS else ""
+    for c in BOOL_COLUMNS:
+        inc[c] = inc[c].astype(str).str.lower().isin(["1", "true", "yes", "y"])
+    return inc[LOG_COLUMNS]
+
+
+def iter_import_chunks(path: str, ref: pd.DataFrame, chunk_rows: int = IMPORT_CHUNK_ROWS):
+    """
+    Stream a field CSV in chunks of chunk_rows, normalized and autofilled.
+    Yields (chunk, autofill_report, bytes_read, total_bytes).
+    """
+    total = max(os.path.getsize(path), 1)
+    with open(path, "r", encoding="utf-8-sig", newline="") as fh:
+        for inc in pd.read_csv(fh, dtype=str, chunksize=chunk_rows):
+            inc, fill = autofill_species_report(normalize_import_chunk(inc), ref)
+            yield inc, fill, min(fh.tell(), total), total
 
 
 def load_species_aliases():
@@ -219,7 +272,15 @@ def load_species_aliases():
     return aliases, alias_to_rec, records
 
 
-def resolve_species(text: str, alias_to_rec: dict, records: list[dict]) -> dict | None:
+def resolve_species(text: str, alias_to_rec: dict, records: list[dict],
+                    index: AliasIndex | None = None, fuzzy: bool = True) -> dict | None:
+    """
+    Record for what was typed: an exact alias, else the best alias containing
+    every token, else (with an index and fuzzy) the closest alias by trigram
+    similarity, so a typo like "quercis macrocarpa" still previews. Saving
+    passes fuzzy=False: a species missing from the DB must not be logged as
+    its nearest neighbour.
+    """
     if not text:
         return None
     t = text.strip()
@@ -227,15 +288,51 @@ def resolve_species(text: str, alias_to_rec: dict, records: list[dict]) -> dict
         return alias_to_rec[t]
     if t.lower() in alias_to_rec:
         return alias_to_rec[t.lower()]
-    # simple fuzzy contains
     tl = t.lower()
     toks = [x for x in tl.split() if x]
-    for rec in records:
-        disp = f"{rec['Genus']} {rec['Species']} ({rec['Common Name']})".lower()
-        if all(tok in disp for tok in toks):
-            return rec
+    if not toks:
+        return None
+    if index is None:
+        # no alias index yet: scan the records
+        for rec in records:
+            disp = f"{rec['Genus']} {rec['Species']} ({rec['Common Name']})".lower()
+            if all(tok in disp for tok in toks):
+                return rec
+        return None
+    # every full display alias holds all of a record's names, so token search over aliases covers records
+    for i in index.iter_ranked(max(toks, key=len)):
+        if all(tok in index.keys[i] for tok in toks):
+            return alias_to_rec.get(index.items[i])
+    if fuzzy:
+        for _, i in index.fuzzy(t, limit=1):
+            return alias_to_rec.get(index.items[i])
     return None
 
+def usage_ranking(index: AliasIndex, alias_to_rec: dict, usage: SpeciesUsage,
+                  pinned: int = MRU_PINNED) -> tuple[list[float], list[str]]:
+    """
+    Suggestion weights aligned with index.items (each alias scores as its
+    species' decayed log usage) and the display aliases of the `pinned`
+    most recently logged species, newest first.
+    """
+    scores = usage.scores()
+    weights = []
+    for alias in index.items:
+        rec = alias_to_rec.get(alias)
+        weights.append(scores.get(SpeciesUsage.key(rec["Genus"], rec["Species"]), 0.0) if rec else 0.0)
+    by_key = {}
+    for rec in alias_to_rec.values():
+        by_key.setdefault(SpeciesUsage.key(rec["Genus"], rec["Species"]), rec)
+    mru = []
+    for k in usage.most_recent(pinned):
+        rec = by_key.get(k)
+        if rec is None:
+            continue
+        alias = f"{rec['Genus']} {rec['Species']} ({rec['Common Name']})".strip()
+        if alias in alias_to_rec:
+            mru.append(alias)
+    return weights, mru
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Main UI
 # ──────────────────────────────────────────────────────────────────────────────
@@ -243,8 +340,6 @@ def build_logger_tab(notebook: ttk.Notebook):
     frame = ttk.Frame(notebook)
     notebook.add(frame, text="📷 Logger")
 
-    ensure_dir_structure()
-
     # ========== TOP TOOLBAR (single row, left-aligned) ==========
     toolbar = ttk.Frame(frame)
     toolbar.grid(row=0, column=0, columnspan=2, sticky="ew", padx=8, pady=(8, 4))
@@ -261,6 +356,15 @@ def build_logger_tab(notebook: ttk.Notebook):
     for i, w in enumerate([btn_new, btn_save, btn_edit, btn_delete, btn_import, btn_exportc, btn_exportx]):
         w.grid(row=0, column=i, padx=4)
 
+    busy_var = tk.StringVar(value="")
+    ttk.Label(toolbar, textvariable=busy_var, style="Muted.TLabel").grid(row=0, column=11, sticky="e", padx=4)
+    jobs = get_job_queue(frame)
+    bus = get_event_bus()
+
+    def set_busy(flag: bool):
+        busy_var.set("Working…" if flag else "")
+        frame.configure(cursor="watch" if flag else "")
+
     # ========== SPLIT: LEFT (Quick Entry) | RIGHT (Filters + Table) ==========
     form_panel = ttk.Frame(frame, style="Card.TFrame", padding=10)
     form_panel.grid(row=1, column=0, sticky="nsew", padx=(8, 4), pady=(0, 8))
@@ -273,8 +377,8 @@ def build_logger_tab(notebook: ttk.Notebook):
 
     # ---------- Quick Entry (LEFT) ----------
     ttk.Label(form_panel, text="Species").grid(row=0, column=0, sticky="e", padx=6, pady=6)
-    aliases, alias_to_rec, records = load_species_aliases()
-    species_entry = AutocompleteEntry(aliases, form_panel, width=36)
+    alias_to_rec, records = {}, []   # filled in once the species DB has loaded
+    species_entry = AutocompleteEntry([], form_panel, width=36)
     species_entry.grid(row=0, column=1, sticky="w", pady=6)
     auto_btn = ttk.Button(form_panel, text="Auto-Fill")
     auto_btn.grid(row=0, column=2, sticky="w", padx=4)
@@ -282,7 +386,7 @@ def build_logger_tab(notebook: ttk.Notebook):
     preview = {k: tk.StringVar() for k in ["Genus", "Species", "Common Name", "Type", "Group"]}
 
     def update_preview(*_):
-        rec = resolve_species(species_entry.get(), alias_to_rec, records)
+        rec = resolve_species(species_entry.get(), alias_to_rec, records, species_entry.index)
         for k in preview:
             preview[k].set(rec.get(k, "") if rec else "")
 
@@ -389,9 +493,12 @@ def build_logger_tab(notebook: ttk.Notebook):
         if c in ("Genus", "Species", "Common Name"): width = 140
         tree.heading(c, text=c); tree.column(c, width=width, anchor="w")
 
-    vsb = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
+    vsb = ttk.Scrollbar(table_frame, orient="vertical")
     hsb = ttk.Scrollbar(table_frame, orient="horizontal", command=tree.xview)
-    tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+    tree.configure(xscrollcommand=hsb.set)
+    # only the rows in view are materialized; vsb is driven by the virtual table
+    table = VirtualTreeview(tree, vsb, table_cols, key_columns=("Timestamp", "Record ID"),
+                            row_tags=lambda d: _row_tags_from_dict(d))
     tree.grid(row=0, column=0, sticky="nsew")
     vsb.grid(row=0, column=1, sticky="ns")
     hsb.grid(row=1, column=0, sticky="ew")
@@ -408,7 +515,24 @@ def build_logger_tab(notebook: ttk.Notebook):
     status = ttk.Label(right_panel, text="", style="Muted.TLabel")
     status.pack(side="bottom", anchor="w", pady=(6, 0))
 
+    # Streaming import progress (shown only while an import runs)
+    import_bar = ttk.Frame(right_panel)
+    import_progress = ttk.Progressbar(import_bar, mode="determinate", maximum=100, length=240)
+    import_progress.pack(side="left")
+    import_label = ttk.Label(import_bar, text="", style="Muted.TLabel")
+    import_label.pack(side="left", padx=8)
+    import_cancel = ttk.Button(import_bar, text="Cancel", command=lambda: cancel_import())
+    import_cancel.pack(side="right")
+
     # ───────── Core actions ─────────
+    compact_after = {"id": None}
+
+    def schedule_compaction():
+        """Fold the append journal into the base log once saving goes quiet."""
+        if compact_after["id"]:
+            frame.after_cancel(compact_after["id"])
+        compact_after["id"] = frame.after(COMPACT_IDLE_MS, get_log_store().compact_in_background)
+
     def clear_form():
         species_entry.delete(0, tk.END)
         for v in preview.values(): v.set("")
@@ -418,14 +542,31 @@ def build_logger_tab(notebook: ttk.Notebook):
         notes_txt.delete("1.0", "end")
         species_entry.focus_set()
 
+    saving = {"job": False}   # one save at a time: a double press must not log the row twice
+
+    def set_saving(flag: bool):
+        saving["job"] = flag
+        for w in (btn_save, fbtn_save):
+            w.state(["disabled" if flag else "!disabled"])
+
     def save_new():
-        rec = resolve_species(species_entry.get(), alias_to_rec, records)
+        if saving["job"]:
+            return
+        text = species_entry.get().strip()
+        rec = resolve_species(text, alias_to_rec, records, species_entry.index, fuzzy=False)
         if not rec:
-            messagebox.showwarning("Species Required", "Enter a valid common or scientific name (then Auto-Fill).")
-            species_entry.focus_set(); return
+            # only a typo-tolerant match: log it only if the user confirms that species
+            near = resolve_species(text, alias_to_rec, records, species_entry.index)
+            if not near:
+                messagebox.showwarning("Species Required", "Enter a valid common or scientific name (then Auto-Fill).")
+                species_entry.focus_set(); return
+            name = f"{near['Genus']} {near['Species']} ({near['Common Name']})"
+            if not messagebox.askyesno("Species Not Found", f"\"{text}\" is not in the species DB.\n\nLog it as {name}?"):
+                species_entry.focus_set(); return
+            rec = near
         row = {
             "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M"),
-            "Record ID": next_record_id(rec["Genus"], rec["Species"]),
+            "Record ID": "",  # allocated by save_log_row
             "Genus": rec["Genus"], "Species": rec["Species"],
             "Common Name": rec["Common Name"], "Type": rec["Type"], "Group": rec["Group"],
             "Photo Path": photo_var.get().strip(),
@@ -435,120 +576,157 @@ def build_logger_tab(notebook: ttk.Notebook):
             "Notes": notes_txt.get("1.0", "end").strip(),
         }
 
-        # prevent duplicate Record ID collision (rare, but safe)
-        df = read_log_df()
-        if (df["Record ID"].astype(str) == row["Record ID"]).any():
-            row["Record ID"] = next_record_id(rec["Genus"], rec["Species"])
-            if (df["Record ID"].astype(str) == row["Record ID"]).any():
-                messagebox.showerror("Duplicate", "Record ID collision; please try again.")
-                return
+        def done(rid: str):
+            set_saving(False)
+            schedule_compaction()
+            bus.publish(LOG_ROWS_ADDED, count=1)
+            clear_form(); reload_table()
+            messagebox.showinfo("Saved", f"Logged {rid}")
+
+        def failed(e: Exception):
+            set_saving(False)
+            if isinstance(e, ValueError):
+                messagebox.showerror("Duplicate", str(e))
+            else:
+                messagebox.showerror("Save Error", str(e))
 
-        df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
-        write_log_df(df)
-        clear_form(); reload_table()
-        messagebox.showinfo("Saved", f"Logged {row['Record ID']}")
+        set_saving(True)
+        jobs.submit(save_log_row, row, on_done=done, on_error=failed, busy=set_busy)
 
     def edit_selected():
-        sel = tree.selection()
+        sel = table.selected_rows()
         if not sel:
             messagebox.showinfo("Edit", "Select a row to edit."); return
-        values = tree.item(sel[0], "values")
-        row_dict = dict(zip(table_cols, values))
-        open_edit_dialog(row_dict)
+        open_edit_dialog(sel[0])
 
     def delete_selected():
-        sel = tree.selection()
+        sel = table.selected_rows()
         if not sel:
             messagebox.showinfo("Delete", "Select at least one row."); return
         if not messagebox.askyesno("Confirm", "Delete selected row(s) from the log? This cannot be undone."):
             return
-        df = read_log_df()
-        keys = []
-        for item in sel:
-            vals = tree.item(item, "values")
-            d = dict(zip(table_cols, vals))
-            keys.append((d["Timestamp"], d["Record ID"]))
-        for ts, rid in keys:
-            df = df[~((df["Timestamp"].astype(str) == str(ts)) & (df["Record ID"].astype(str) == str(rid)))]
-        write_log_df(df)
-        reload_table()
+        keys = [(d["Timestamp"], d["Record ID"]) for d in sel]
+        def deleted(n: int):
+            bus.publish(LOG_ROWS_DELETED, count=n)
+            reload_table()
+
+        jobs.submit(get_log_store().delete, keys, on_done=deleted,
+                    on_error=lambda e: messagebox.showerror("Delete Error", str(e)), busy=set_busy)
+
+    importing = {"job": None, "cancel": False}
 
     def import_csv():
+        if importing["job"]:
+            messagebox.showinfo("Import", "An import is already running."); return
         path = filedialog.askopenfilename(
             title="Import CSV and append to log",
             filetypes=[("CSV", "*.csv")]
         )
         if not path:
             return
-        try:
-            inc = pd.read_csv(path, dtype=str).fillna("")
-            for c in LOG_COLUMNS:
-                if c not in inc.columns:
-                    inc[c] = False if c in BOOL_COLUMNS else ""
-            for c in BOOL_COLUMNS:
-                inc[c] = inc[c].astype(str).str.lower().isin(["1", "true", "yes", "y"])
-            inc = inc[LOG_COLUMNS]
 
-            ref = load_reference_db()
-            inc = autofill_species(inc, ref)
+        def prepare():
+            """Worker: read the reference list and snapshot the Record ID index."""
+            return iter_import_chunks(path, load_reference_db()), ImportBatch(get_log_store())
+
+        def not_started(e: Exception):
+            importing["job"] = None
+            import_bar.pack_forget()
+            messagebox.showerror("Import Error", str(e))
+
+        importing["job"] = True
+        importing["cancel"] = False
+        import_progress["value"] = 0
+        import_label.configure(text="Importing…")
+        import_cancel.state(["!disabled"])
+        import_bar.pack(side="bottom", fill="x", pady=(6, 0))
+        jobs.submit(prepare, on_done=lambda r: run_import(*r), on_error=not_started, busy=set_busy)
 
-            df = read_log_df()
-            existing = df[["Genus", "Species", "Record ID"]].copy()
-            for idx, row in inc.iterrows():
-                rid = str(row.get("Record ID", "")).strip()
-                if not rid:
-                    g = row.get("Genus", "")
-                    s = row.get("Species", "")
-                    subset = existing[(existing["Genus"] == g) & (existing["Species"] == s)]
-                    n = 0
-                    for ridx in subset.get("Record ID", pd.Series(dtype=str)).dropna().astype(str):
-                        m = re.search(r"_(\d+)$", ridx)
-                        if m:
-                            n = max(n, int(m.group(1)))
-                    rid = f"{safe_slug(g)}_{safe_slug(s)}_{(n + 1):02d}"
-                    inc.at[idx, "Record ID"] = rid
-                    existing = pd.concat([existing, pd.DataFrame([{ "Genus": g, "Species": s, "Record ID": rid }])], ignore_index=True)
+    def run_import(chunks, batch: ImportBatch):
+        fill = {"filled": 0, "ambiguous": 0, "unresolved": 0}
+        started = time.perf_counter()
 
-            df = pd.concat([df, inc], ignore_index=True)
-            write_log_df(df)
-            messagebox.showinfo("Import", f"Imported {len(inc)} rows.")
+        def finish(msg: str | None = None):
+            chunks.close()   # releases the CSV handle if the import stopped early
+            importing["job"] = None
+            import_bar.pack_forget()
+            if msg:
+                status.configure(text=msg)
+
+        def read_chunk():
+            """Worker: parse, autofill and stage the next chunk; None at end of file."""
+            try:
+                inc, f, done, total = next(chunks)
+            except StopIteration:
+                return None
+            batch.add(inc)
+            return f, done, total
+
+        def failed(e: Exception):
+            batch.rollback()
+            finish(); messagebox.showerror("Import Error", str(e))
+
+        def committed(_):
+            finish()
+            schedule_compaction()
+            bus.publish(LOG_ROWS_ADDED, count=batch.rows)
             reload_table()
-        except Exception as e:
-            messagebox.showerror("Import Error", str(e))
+            messagebox.showinfo(
+                "Import",
+                f"Imported {batch.rows:,} rows.\n"
+                f"Species autofill: {fill['filled']} filled, {fill['ambiguous']} ambiguous, "
+                f"{fill['unresolved']} unresolved."
+            )
+
+        def step(result=False):
+            if importing["cancel"]:
+                batch.rollback()
+                finish("Import cancelled; nothing was added.")
+                return
+            if result is None:
+                import_label.configure(text=f"Committing {batch.rows:,} rows…")
+                import_cancel.state(["disabled"])   # the commit can't be cancelled
+                jobs.submit(batch.commit, on_done=committed, on_error=failed, busy=set_busy)
+                return
+            if result:
+                f, done, total = result
+                for k in fill:
+                    fill[k] += f[k]
+                rate = batch.rows / max(time.perf_counter() - started, 1e-6)
+                import_progress["value"] = 100.0 * done / total
+                import_label.configure(text=f"Importing… {batch.rows:,} rows  ({rate:,.0f} rows/s)")
+            jobs.submit(read_chunk, on_done=step, on_error=failed, busy=set_busy)
+
+        step()
+
+    def cancel_import():
+        if importing["job"] and not importing["cancel"] and not import_cancel.instate(["disabled"]):
+            importing["cancel"] = True
+            import_label.configure(text="Cancelling…")
+
+    def export_view(title: str, ext: str, filetypes: list, write):
+        def filtered(df: pd.DataFrame):
+            if df.empty:
+                messagebox.showinfo("Export", "No rows to export."); return
+            path = filedialog.asksaveasfilename(title=title, defaultextension=ext, filetypes=filetypes)
+            if not path:
+                return
+            jobs.submit(write, df, path,
+                        on_done=lambda _: messagebox.showinfo("Export", f"Saved: {path}"),
+                        on_error=lambda e: messagebox.showerror("Export Error", str(e)),
+                        busy=set_busy)
+
+        # filtering re-reads the log and may build a search index: keep it off the Tk thread
+        jobs.submit(filtered_df, current_filters(), on_done=filtered,
+                    on_error=lambda e: messagebox.showerror("Export Error", str(e)), busy=set_busy)
 
     def export_csv():
-        df = filtered_df()
-        if df.empty:
-            messagebox.showinfo("Export", "No rows to export."); return
-        path = filedialog.asksaveasfilename(
-            title="Export filtered view (CSV)",
-            defaultextension=".csv",
-            filetypes=[("CSV", "*.csv")]
-        )
-        if not path:
-            return
-        try:
-            df.to_csv(path, index=False)
-            messagebox.showinfo("Export", f"Saved: {path}")
-        except Exception as e:
-            messagebox.showerror("Export Error", str(e))
+        export_view("Export filtered view (CSV)", ".csv", [("CSV", "*.csv")],
+                    lambda df, path: df.to_csv(path, index=False))
 
     def export_excel():
-        df = filtered_df()
-        if df.empty:
-            messagebox.showinfo("Export", "No rows to export."); return
-        path = filedialog.asksaveasfilename(
-            title="Export filtered view (Excel)",
-            defaultextension=".xlsx",
-            filetypes=[("Excel", "*.xlsx")]
-        )
-        if not path:
-            return
-        try:
-            df.to_excel(path, index=False)
-            messagebox.showinfo("Export", f"Saved: {path}")
-        except Exception as e:
-            messagebox.showerror("Export Error", str(e))
+        export_view("Export filtered view (Excel)", ".xlsx", [("Excel", "*.xlsx")],
+                    lambda df, path: df.to_excel(path, index=False))
 
     # Wire toolbar + form buttons
     btn_new.configure(command=clear_form)
@@ -564,11 +742,14 @@ def build_logger_tab(notebook: ttk.Notebook):
     auto_btn.configure(command=update_preview)
 
     # ---------- Filtering / Rendering ----------
-    def filtered_df() -> pd.DataFrame:
-        df = read_log_df()
-        # populate dropdowns dynamically
-        types = sorted([t for t in df["Type"].dropna().astype(str).unique().tolist() if t.strip()])
-        groups = sorted([g for g in df["Group"].dropna().astype(str).unique().tolist() if g.strip()])
+    def current_filters() -> tuple:
+        return (type_cb.get(), group_cb.get(), status_cb.get(), bool(only_missing.get()), search_var.get())
+
+    def filtered_df(filters: tuple) -> pd.DataFrame:
+        """Worker: the log under the given filters (current_filters(), read on the Tk thread)."""
+        return filter_log(read_log_df(), *filters)[0]
+
+    def refresh_filter_options(types: list[str], groups: list[str]):
         t_vals = ["All"] + types
         g_vals = ["All"] + groups
         if tuple(type_cb["values"]) != tuple(t_vals):
@@ -576,42 +757,6 @@ def build_logger_tab(notebook: ttk.Notebook):
         if tuple(group_cb["values"]) != tuple(g_vals):
             group_cb["values"] = g_vals
 
-        # work on a copy & normalize boolean-ish columns
-        out = df.copy()
-        for col in ["Has Leaf","Has Bark","Has Tree","Has Other","Scanned","Archived"]:
-            out[col] = out[col].astype(str).str.lower().isin({"true","1","yes"}).fillna(False)
-
-        tsel = type_cb.get()
-        gsel = group_cb.get()
-        ssel = status_cb.get()
-        term = search_var.get().strip().lower()
-
-        if tsel and tsel != "All":
-            out = out[out["Type"].astype(str) == tsel]
-        if gsel and gsel != "All":
-            out = out[out["Group"].astype(str) == gsel]
-
-        if ssel == "Scanned":
-            out = out[out["Scanned"]]
-        elif ssel == "Unscanned":
-            out = out[~out["Scanned"]]
-        elif ssel == "Archived":
-            out = out[out["Archived"]]
-        elif ssel == "Unarchived":
-            out = out[~out["Archived"]]
-
-        if only_missing.get():
-            out = out[~(out["Has Leaf"] & out["Has Bark"] & out["Has Tree"] & out["Has Other"])]
-
-        if term:
-            term_cols = ["Genus", "Species", "Common Name", "Record ID", "Notes"]
-            mask = False
-            for c in term_cols:
-                mask = mask | out[c].astype(str).str.lower().str.contains(term, na=False)
-            out = out[mask]
-
-        return out
-
     def _row_tags_from_dict(d: dict):
         def as_bool(x): return str(x).lower() in {"true","1","yes"}
         tags = []
@@ -622,15 +767,31 @@ def build_logger_tab(notebook: ttk.Notebook):
             tags.append("archived")
         return tags
 
+    reload_gen = {"n": 0}   # bumped per request; older results are dropped
+    search = IncrementalFilter(LOG_SEARCH_COLUMNS)
+
     def reload_table():
-        df = filtered_df()
-        tree.delete(*tree.get_children())
-        for i, r in df.iterrows():
-            vals = [r.get(c, "") for c in table_cols]
-            tags = _row_tags_from_dict(r.to_dict())
-            if i % 2 == 0:
-                tags.append("zebra_even")
-            tree.insert("", "end", values=vals, tags=tuple(tags))
+        search_debounce.cancel()
+        reload_gen["n"] += 1
+        gen = reload_gen["n"]
+
+        def run(filters):
+            _, layout, df = get_log_store().snapshot()
+            return gen, filter_log(df, *filters, is_stale=lambda: gen != reload_gen["n"],
+                                   search=search, version=layout)
+
+        jobs.submit(run, current_filters(),
+                    key="logger-reload", on_done=render_table, busy=set_busy,
+                    on_error=lambda e: status.configure(text=f"Could not read log: {e}"))
+
+    search_debounce = Debouncer(frame, get_search_debounce_ms(), reload_table)
+
+    def render_table(result):
+        gen, (df, types, groups) = result
+        if gen != reload_gen["n"]:
+            return  # superseded by newer input
+        refresh_filter_options(types, groups)
+        table.set_frame(df)
         status.configure(text=f"{len(df):,} row(s) shown")
 
     # ---------- Edit dialog ----------
@@ -668,19 +829,20 @@ def build_logger_tab(notebook: ttk.Notebook):
         ttk.Button(btns, text="Cancel", command=win.destroy).pack(side="right", padx=4)
 
         def save_edit():
-            df = read_log_df()
-            ts_key, rid_key = row["Timestamp"], row["Record ID"]
-            mask = (df["Timestamp"].astype(str) == str(ts_key)) & (df["Record ID"].astype(str) == str(rid_key))
-            if not mask.any():
-                messagebox.showerror("Not Found", "Original row not found. It may have been changed or deleted.")
-                return
-            for k, e in fields.items():
-                df.loc[mask, k] = e.get().strip()
-            for k, v in checks.items():
-                df.loc[mask, k] = bool(v.get())
-            write_log_df(df)
-            win.destroy()
-            reload_table()
+            values = {k: e.get().strip() for k, e in fields.items()}
+            values.update({k: bool(v.get()) for k, v in checks.items()})
+
+            def done(n: int):
+                if not n:
+                    messagebox.showerror("Not Found", "Original row not found. It may have been changed or deleted.")
+                    return
+                win.destroy()
+                bus.publish(LOG_ROWS_EDITED, count=n)
+                reload_table()
+
+            jobs.submit(get_log_store().update, row["Timestamp"], row["Record ID"], values,
+                        on_done=done, on_error=lambda e: messagebox.showerror("Save Error", str(e)),
+                        busy=set_busy)
 
         ttk.Button(btns, text="Save", command=save_edit).pack(side="right", padx=4)
 
@@ -689,7 +851,8 @@ def build_logger_tab(notebook: ttk.Notebook):
     type_cb.bind("<<ComboboxSelected>>", on_change)
     group_cb.bind("<<ComboboxSelected>>", on_change)
     status_cb.bind("<<ComboboxSelected>>", on_change)
-    search_var.trace_add("write", on_change)
+    search_var.trace_add("write", lambda *_: search_debounce())
+    search_entry.bind("<Return>", lambda e: search_debounce.flush())
     species_entry.bind("<Return>", lambda e: update_preview())
     tree.bind("<Double-1>", lambda e: edit_selected())
 
@@ -711,6 +874,60 @@ def build_logger_tab(notebook: ttk.Notebook):
     top.bind_all("<F1>", lambda e: show_shortcuts())
 
     # Initial state
+    def load_aliases_and_index():
+        """Worker: read the aliases and build their match index off the Tk thread."""
+        aliases, a2r, recs = load_species_aliases()
+        return aliases, a2r, recs, AliasIndex(aliases)
+
+    def aliases_loaded(result):
+        aliases, a2r, recs, index = result
+        alias_to_rec.clear(); alias_to_rec.update(a2r)
+        records[:] = recs
+        species_entry.set_autocomplete_list(aliases, index)
+        update_preview()
+        refresh_usage()
+
+    def load_aliases():
+        jobs.submit(load_aliases_and_index, key="logger-aliases", on_done=aliases_loaded, busy=set_busy)
+
+    def refresh_usage(*_args, **_payload):
+        """Re-rank suggestions from the store's usage counts (kept current on save/import)."""
+        index = species_entry.index
+
+        def run(a2r):
+            weights, pinned = usage_ranking(index, a2r, get_log_store().species_usage())
+            return index, weights, pinned, weight_rank(weights)
+
+        def ranked(result):
+            ranked_index, weights, pinned, rank = result
+            if ranked_index is species_entry.index:   # skip if the alias list was replaced meanwhile
+                species_entry.set_usage(weights, pinned, rank)
+
+        jobs.submit(run, dict(alias_to_rec), key="logger-usage", on_done=ranked)
+
+    # a newly opened or edited species DB changes the autocomplete list; pick it up when shown
+    aliases_refresh = RefreshWhenVisible(notebook, frame, load_aliases)
+    bus.subscribe(SPECIES_DB_RELOADED, aliases_refresh.mark_dirty)
+    for topic in LOG_CHANGED:
+        bus.subscribe(topic, refresh_usage)
+
+    # opening the store may migrate a legacy workbook: do it on a worker, log actions disabled meanwhile
+    log_actions = [btn_save, btn_edit, btn_delete, btn_import, btn_exportc, btn_exportx, fbtn_save]
+
+    def store_opened(_store):
+        for w in log_actions:
+            w.state(["!disabled"])
+        reload_table()
+
+    def store_failed(e: Exception):
+        status.configure(text="The log could not be opened.")
+        messagebox.showerror("Log Error", str(e))
+
+    for w in log_actions:
+        w.state(["disabled"])
+    status.configure(text="Opening log…")
+    jobs.submit(ensure_dir_structure, on_done=store_opened, on_error=store_failed, busy=set_busy)
+
+    load_aliases()
     update_preview()
-    reload_table()
     species_entry.focus_set()
@@ -1,34 +1,39 @@
+import startup  # first, so startup timing covers every import below
+
+import importlib
+import importlib.util
+import os
+import sys
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 
 from utils import (
     apply_theme, set_theme, set_dpi_awareness, load_logo,
     get_available_themes, get_current_theme_name
 )
 
-try:
-    from logger_tab import build_logger_tab
-except Exception:
-    def build_logger_tab(notebook: ttk.Notebook):
-        frame = ttk.Frame(notebook)
-        notebook.add(frame, text="\ud83d\udcf7 Logger")
-        ttk.Label(frame, text="pandas is required for the Logger tab").pack(padx=10, pady=10)
-
-try:
-    from species_db import build_species_db_tab
-except Exception:
-    def build_species_db_tab(notebook: ttk.Notebook, default_path: str = ""):
-        frame = ttk.Frame(notebook)
-        notebook.add(frame, text="\ud83c\udf33 Species DB")
-        ttk.Label(frame, text="pandas is required for the Species DB tab").pack(padx=10, pady=10)
-
-try:
-    from audit_tab import build_audit_tab
-except Exception:
-    def build_audit_tab(notebook: ttk.Notebook):
+def tab_builder(module: str, func: str, text: str, label: str):
+    """
+    Builder that imports `module` only when its tab is first built, so
+    neither the tab modules nor pandas load before the window is up. If the
+    import fails the tab says why (label names it in the message) and the
+    traceback goes to stderr.
+    """
+    def build(notebook: ttk.Notebook):
+        if importlib.util.find_spec("pandas") is None:
+            message = f"pandas is required for the {label} tab"
+        else:
+            try:
+                build_tab = getattr(importlib.import_module(module), func)
+            except Exception as e:
+                sys.excepthook(*sys.exc_info())
+                message = f"The {label} tab could not be loaded:\n{type(e).__name__}: {e}"
+            else:
+                return build_tab(notebook)
         frame = ttk.Frame(notebook)
-        notebook.add(frame, text="\ud83d\udcca Audit")
-        ttk.Label(frame, text="pandas is required for the Audit tab").pack(padx=10, pady=10)
+        notebook.add(frame, text=text)
+        ttk.Label(frame, text=message).pack(padx=10, pady=10)
+    return build
 
 APP_NAME = "IFML – TimberView"
 
@@ -75,11 +80,65 @@ def build_theme_menu(root: tk.Tk, menubar: tk.Menu):
             command=lambda n=name: on_change(n)
         )
 
+def add_lazy_tabs(notebook: ttk.Notebook, tabs):
+    """
+    Add a placeholder tab per (text, builder) and run builder(notebook) only
+    when its tab is first selected; the built tab takes the placeholder's
+    place. The initially selected tab is built once the window is up.
+    """
+    pending = {}
+    for text, builder in tabs:
+        placeholder = ttk.Frame(notebook)
+        ttk.Label(placeholder, text="Loading…", style="Muted.TLabel").pack(padx=10, pady=10)
+        notebook.add(placeholder, text=text)
+        pending[str(placeholder)] = (placeholder, builder)
+
+    def build(placeholder, builder):
+        before = set(notebook.tabs())
+        builder(notebook)
+        built = [t for t in notebook.tabs() if t not in before]
+        pos = notebook.index(placeholder)
+        for i, tab in enumerate(built):
+            notebook.insert(pos + i, tab)
+        if built:
+            notebook.select(built[0])
+        notebook.forget(placeholder)
+        placeholder.destroy()
+
+    def on_tab_changed(_event=None):
+        entry = pending.pop(str(notebook.select()), None)
+        if entry:
+            build(*entry)
+
+    notebook.bind("<<NotebookTabChanged>>", on_tab_changed, add="+")
+    notebook.after_idle(on_tab_changed)
+
+def export_full_log(root: tk.Tk):
+    """Snapshot the whole log store to a workbook (xlsx is an export format only), on a worker."""
+    try:
+        from jobs import get_job_queue
+        from log_store import LOG_PATH, get_log_store
+    except Exception as e:
+        messagebox.showerror("Export Error", str(e)); return
+    path = filedialog.asksaveasfilename(
+        title="Export full log (Excel)",
+        initialfile=os.path.basename(LOG_PATH),
+        defaultextension=".xlsx",
+        filetypes=[("Excel", "*.xlsx")]
+    )
+    if not path:
+        return
+    get_job_queue(root).submit(
+        lambda: get_log_store().export_excel(path),
+        on_done=lambda _: messagebox.showinfo("Export", f"Saved: {path}"),
+        on_error=lambda e: messagebox.showerror("Export Error", str(e)),
+    )
+
 def main() -> int:
     try:
         root = tk.Tk()
     except tk.TclError as e:
-        print(f"GUI disabled: {e}")
+        print(f"GUI disabled: {e}", flush=True)
         return 0
     root.title(APP_NAME)
     root.geometry("1220x780")
@@ -96,14 +155,20 @@ def main() -> int:
 
     nb = ttk.Notebook(content); nb.pack(fill="both", expand=True)
 
-    build_logger_tab(nb)
-    build_species_db_tab(nb)
-    build_audit_tab(nb)
+    # tabs are built on first view so the window appears before any data is read
+    root.after_idle(startup.first_window, root)
+    add_lazy_tabs(nb, [
+        ("📷 Logger", tab_builder("logger_tab", "build_logger_tab", "📷 Logger", "Logger")),
+        ("Species DB", tab_builder("species_db", "build_species_db_tab", "Species DB", "Species DB")),
+        ("📊 Audit", tab_builder("audit_tab", "build_audit_tab", "📊 Audit", "Audit")),
+    ])
 
     build_footer(shell)
 
     menubar = tk.Menu(root); root.config(menu=menubar)
     filem = tk.Menu(menubar, tearoff=False); menubar.add_cascade(label="File", menu=filem)
+    filem.add_command(label="Export Full Log (Excel)…", command=lambda: export_full_log(root))
+    filem.add_separator()
     filem.add_command(label="Quit", command=root.destroy)
     helpm = tk.Menu(menubar, tearoff=False); menubar.add_cascade(label="Help", menu=helpm)
     helpm.add_command(label="About", command=lambda: messagebox.showinfo("About", APP_NAME))
@@ -24,3 +24,15 @@ def set_db_path(path: str):
 
 def get_db_path(default: str = "") -> str:
     return _read_cfg().get("species_db_path", default)
+
+def get_log_backend(default: str = "sqlite") -> str:
+    return _read_cfg().get("log_backend", default)
+
+def get_log_journal(default: bool = False) -> bool:
+    return bool(_read_cfg().get("log_journal", default))
+
+def get_search_debounce_ms(default: int = 250) -> int:
+    try:
+        return max(0, int(_read_cfg().get("search_debounce_ms", default)))
+    except (TypeError, ValueError):
+        return default
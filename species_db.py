@@ -1,11 +1,17 @@
 # species_db.py (stable build)
 # Requires: pandas, openpyxl (for .xlsx)
+from __future__ import annotations
 
 import os
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
+from lazy_import import lazy_module
+pd = lazy_module("pandas")
 from shared_config import set_db_path  # <-- saves chosen path for the logger
+from jobs import get_job_queue
+from tree_sync import RenderScheduler, TreeReconciler
+from events import SPECIES_DB_RELOADED, get_event_bus
 
 DISPLAY_ORDER = ["Genus", "Species", "Common Name", "Family"]
 HEADER_ALIASES = {
@@ -48,6 +54,12 @@ class SpeciesDBController:
         self.file_path = ""
         self.df_full = pd.DataFrame()
         self.df_view = pd.DataFrame()
+        self.jobs = get_job_queue(tree)
+        self.rows_view = TreeReconciler(tree)
+        self.renderer = RenderScheduler(tree, status=lambda txt: txt and self._set_status(txt))
+        self.on_loaded = None  # called on the Tk thread after a file finishes loading
+        self._write_lock = threading.Lock()
+        self._written = None   # (path, frame) of the newest add_species write, so quick Adds chain
 
         # Preconfigure columns so UI is never blank
         self.tree["columns"] = DISPLAY_ORDER
@@ -67,32 +79,52 @@ class SpeciesDBController:
             return
         self.load_from_path(path)
 
+    @staticmethod
+    def _load_frame(path: str) -> pd.DataFrame:
+        """Worker side of load_from_path: read, normalize and remember the path."""
+        df = _read_any(path)
+        df = _normalize_headers(df)
+        df = _ensure_columns(df, DISPLAY_ORDER)
+        set_db_path(path)  # <-- share with logger
+        return df.fillna("")
+
     def load_from_path(self, path: str):
-        try:
-            df = _read_any(path)
-            df = _normalize_headers(df)
-            df = _ensure_columns(df, DISPLAY_ORDER)
-            self.df_full = df.fillna("")
-            self.file_path = path
-            set_db_path(self.file_path)  # <-- share with logger (confirmed present before) :contentReference[oaicite:1]{index=1}
-            self._refresh_view_table()
-            self._set_status(f"Loaded: {os.path.basename(path)}  |  {len(self.df_full)} rows")
-            self._show_nofile(False)
-        except Exception as e:
-            messagebox.showerror("Load Error", f"Failed to load file:\n{e}")
-            self._show_nofile(True)
+        self._set_status(f"Loading {os.path.basename(path)}…")
+        self.jobs.submit(self._load_frame, path, key="species-load",
+                         on_done=lambda df: self._loaded(path, df),
+                         on_error=self._load_failed)
+
+    def _loaded(self, path: str, df: pd.DataFrame):
+        self.df_full = df
+        self._written = None
+        self.file_path = path
+        self._refresh_view_table(status=f"Loaded: {os.path.basename(path)}  |  {len(self.df_full)} rows")
+        self._show_nofile(False)
+        if self.on_loaded:
+            self.on_loaded()
+        get_event_bus().publish(SPECIES_DB_RELOADED, path=path)
+
+    def _load_failed(self, e: Exception):
+        messagebox.showerror("Load Error", f"Failed to load file:\n{e}")
+        self._set_status("Ready")
+        self._show_nofile(not self.file_path)
 
     # ---------- Table ops ----------
-    def _refresh_view_table(self, filtered_df: pd.DataFrame = None):
+    def _refresh_view_table(self, filtered_df: pd.DataFrame = None, status: str = ""):
+        """Show filtered_df (default: the whole file); status is shown once every row is in."""
         df = filtered_df if filtered_df is not None else self.df_full
         self.df_view = df[DISPLAY_ORDER].copy() if not df.empty else pd.DataFrame(columns=DISPLAY_ORDER)
 
-        self.tree.delete(*self.tree.get_children())
-        for _, row in self.df_view.iterrows():
-            self.tree.insert("", "end", values=[row.get(c, "") for c in DISPLAY_ORDER])
-
         if self.file_path and self.df_view.empty:
-            self._set_status("File loaded but no rows found.")
+            status = "File loaded but no rows found."
+
+        def finished():
+            if status:
+                self._set_status(status)
+
+        rows = (((row["Genus"], row["Species"]), [row.get(c, "") for c in DISPLAY_ORDER], ())
+                for row in self.df_view.to_dict(orient="records"))
+        self.renderer.start(self.rows_view.steps(rows), len(self.df_view), on_done=finished)
 
     # ---------- Search ----------
     def filter_rows(self, q: str):
@@ -101,15 +133,13 @@ class SpeciesDBController:
             self._set_status("Open a database file to search.")
             return
         if not q:
-            self._refresh_view_table(self.df_full)
-            self._set_status(f"{len(self.df_full)} rows")
+            self._refresh_view_table(self.df_full, status=f"{len(self.df_full)} rows")
             return
         mask = pd.Series(False, index=self.df_full.index)
         for col in DISPLAY_ORDER:
             mask |= self.df_full[col].fillna("").str.lower().str.contains(q)
         filt = self.df_full[mask]
-        self._refresh_view_table(filt)
-        self._set_status(f"{len(filt)} matching rows")
+        self._refresh_view_table(filt, status=f"{len(filt)} matching rows")
 
     # ---------- Add row ----------
     def add_species(self, genus: str, species: str, common: str, family: str):
@@ -131,21 +161,30 @@ class SpeciesDBController:
         new_row["Common Name"] = common
         new_row["Family"] = family
 
-        if self.df_full.empty:
-            self.df_full = pd.DataFrame(columns=DISPLAY_ORDER)
-
-        self.df_full = pd.concat([self.df_full, pd.DataFrame([new_row])], ignore_index=True)
-
-        try:
-            _write_any(self.df_full, self.file_path)
+        shown = self.df_full if not self.df_full.empty else pd.DataFrame(columns=DISPLAY_ORDER)
+        path = self.file_path
+
+        def write() -> pd.DataFrame:
+            # one write at a time, each on top of the previous one, so two quick Adds both land
+            with self._write_lock:
+                last = self._written
+                base = last[1] if last and last[0] == path else shown
+                df = pd.concat([base, pd.DataFrame([new_row])], ignore_index=True)
+                _write_any(df, path)
+                self._written = (path, df)
             # keep shared path fresh in case user created/moved the file externally
-            set_db_path(self.file_path)
-        except Exception as e:
-            messagebox.showerror("Save Error", f"Could not write to file:\n{e}")
-            return
+            set_db_path(path)
+            return df
+
+        def done(df: pd.DataFrame):
+            last = self._written   # a later Add may already have finished; show the newest frame
+            self.df_full = last[1] if last and last[0] == path else df
+            self._refresh_view_table(status=f"Added {genus} {species}. Total {len(self.df_full)} rows.")
+            get_event_bus().publish(SPECIES_DB_RELOADED, path=path)
 
-        self._refresh_view_table()
-        self._set_status(f"Added {genus} {species}. Total {len(self.df_full)} rows.")
+        self._set_status(f"Saving {genus} {species}…")
+        self.jobs.submit(write, on_done=done,
+                         on_error=lambda e: messagebox.showerror("Save Error", f"Could not write to file:\n{e}"))
 
     def _set_status(self, txt: str):
         if self.status_var is not None:
@@ -231,10 +270,10 @@ def build_species_db_tab(notebook: ttk.Notebook, default_path: str = ""):
 
     controller = SpeciesDBController(tv, status_var, nofile_label)
 
-    btn_open.configure(command=lambda: (
-        controller.select_file(),
-        lbl_path.configure(text=os.path.basename(controller.file_path) if controller.file_path else "")
-    ))
+    controller.on_loaded = lambda: lbl_path.configure(
+        text=os.path.basename(controller.file_path) if controller.file_path else ""
+    )
+    btn_open.configure(command=controller.select_file)
     ent_search.bind("<KeyRelease>", lambda e: controller.filter_rows(ent_search.get()))
     btn_add.configure(command=lambda: (
         controller.add_species(e_genus.get(), e_species.get(), e_common.get(), e_family.get()),
@@ -242,14 +281,8 @@ def build_species_db_tab(notebook: ttk.Notebook, default_path: str = ""):
         e_common.delete(0, "end"), e_family.delete(0, "end")
     ))
 
+    controller._show_nofile(True)
     if default_path and os.path.exists(default_path):
-        try:
-            controller.load_from_path(default_path)
-            lbl_path.configure(text=os.path.basename(default_path))
-        except Exception as e:
-            messagebox.showwarning("Auto Load", f"Could not auto-load default file:\n{e}")
-            controller._show_nofile(True)
-    else:
-        controller._show_nofile(True)
+        controller.load_from_path(default_path)
 
     return parent
@@ -0,0 +1,94 @@
+# startup.py — startup timing: per-module import cost and time to first window
+# Import this first (main.py does) so the clock and import timer cover everything after it.
+import atexit
+import os
+import sys
+import time
+
+T0 = time.perf_counter()
+
+IMPORT_REPORT_ENV = "IFML_IMPORT_REPORT"    # "1": print per-module import cost to stderr
+FIRST_WINDOW_ENV = "IFML_FIRST_WINDOW"      # "1": print time to first window and quit (bench.py startup)
+REPORT_TOP = 25
+
+
+class _TimedLoader:
+    """Wraps a module loader to time exec_module(); everything else is delegated."""
+
+    def __init__(self, loader, timer: "ImportTimer"):
+        self.__dict__["_loader"] = loader
+        self.__dict__["_timer"] = timer
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._timer.run(module.__name__, self._loader.exec_module, module)
+
+
+class ImportTimer:
+    """
+    Meta path hook recording, per newly imported module, the time spent
+    executing it: self (excluding nested imports) and cumulative.
+    """
+
+    def __init__(self):
+        self.times: dict[str, list[float]] = {}   # name -> [self, cumulative]
+        self._stack: list[float] = []             # nested-import time of each module being executed
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self)
+                return spec
+        return None
+
+    def run(self, name, fn, *args):
+        self._stack.append(0.0)
+        t = time.perf_counter()
+        try:
+            fn(*args)
+        finally:
+            total = time.perf_counter() - t
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += total
+            self.times[name] = [total - nested, total]
+
+    def report(self, title: str, top: int = REPORT_TOP) -> str:
+        rows = sorted(self.times.items(), key=lambda kv: kv[1][1], reverse=True)[:top]
+        lines = [f"{title}: {len(self.times)} modules, "
+                 f"{sum(s for s, _ in self.times.values()) * 1000:.0f} ms importing",
+                 f"  {'self ms':>9} {'cumul. ms':>10}  module"]
+        lines += [f"  {s * 1000:9.1f} {c * 1000:10.1f}  {name}" for name, (s, c) in rows]
+        return "\n".join(lines)
+
+
+_TIMER: ImportTimer | None = None
+
+if os.environ.get(IMPORT_REPORT_ENV) == "1":
+    _TIMER = ImportTimer()
+    sys.meta_path.insert(0, _TIMER)
+    atexit.register(lambda: print(_TIMER.report("imports at exit"), file=sys.stderr))
+
+
+def elapsed() -> float:
+    """Seconds since startup.py was imported."""
+    return time.perf_counter() - T0
+
+
+def first_window(root):
+    """Called once the main window is up: report, and quit early when probing."""
+    t = elapsed()
+    if _TIMER is not None:
+        print(_TIMER.report(f"imports before first window ({t * 1000:.0f} ms)"), file=sys.stderr)
+    if os.environ.get(FIRST_WINDOW_ENV) == "1":
+        print(f"first-window {t:.3f}", flush=True)
+        root.destroy()
@@ -0,0 +1,131 @@
+# Crash and failure recovery of the journaled log backend.
+import os
+
+import pandas as pd
+import pytest
+
+from log_store import LOG_COLUMNS, ExcelBackend, JournaledBackend, SQLiteBackend
+
+
+class LockedWorkbook(ExcelBackend):
+    """ExcelBackend whose writes fail while `locked` is set, as when the workbook is open in Excel."""
+
+    locked = False
+
+    def append_journaled(self, df, seq):
+        if self.locked:
+            raise PermissionError("workbook is open")
+        super().append_journaled(df, seq)
+
+
+def row(i: int, rid: str | None = None) -> pd.DataFrame:
+    rec = dict.fromkeys(LOG_COLUMNS, "")
+    rec.update({"Timestamp": f"2026-01-{i:02d} 10:00", "Record ID": rid or f"genus_species_{i:02d}"})
+    return pd.DataFrame([rec])
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    return LockedWorkbook(os.path.join(tmp_path, "log.xlsx"))
+
+
+def test_failed_compaction_keeps_rows(workbook):
+    journal = JournaledBackend(workbook)
+    journal.append(row(1))
+    workbook.locked = True
+    for i in (2, 3):
+        with pytest.raises(PermissionError):
+            journal.compact()
+        assert len(journal.read()) == i - 1
+        journal.append(row(i))
+    workbook.locked = False
+    journal.compact()
+    assert list(workbook.read()["Record ID"]) == [f"genus_species_{i:02d}" for i in (1, 2, 3)]
+    assert journal.pending() == 0
+
+
+def test_append_after_torn_line_is_kept(workbook):
+    journal = JournaledBackend(workbook)
+    journal.append(row(1))
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"Timestamp": "2026-01-02 1')   # interrupted write
+    journal = JournaledBackend(workbook)
+    journal.append(row(3))
+    assert list(journal.read()["Record ID"]) == ["genus_species_01", "genus_species_03"]
+
+
+@pytest.mark.parametrize("kind", ["xlsx", "sqlite"])
+def test_crash_after_base_write_is_not_replayed(tmp_path, kind):
+    if kind == "xlsx":
+        base = ExcelBackend(os.path.join(tmp_path, "log.xlsx"))
+    else:
+        base = SQLiteBackend(os.path.join(tmp_path, "log.sqlite3"), legacy_path="")
+    journal = JournaledBackend(base)
+    journal.append(row(1))
+    journal.append(row(2))
+    # the base write of a compaction succeeded, then the process died before *.compacting was removed
+    os.replace(journal.path, journal.compacting_path)
+    records = journal._read_lines(journal.compacting_path)
+    base.append_journaled(pd.DataFrame(records), max(r["_seq"] for r in records))
+
+    journal = JournaledBackend(base)
+    assert len(journal.read()) == 2
+    journal.append(row(3))
+    journal.compact()
+    assert list(base.read()["Record ID"]) == ["genus_species_01", "genus_species_02", "genus_species_03"]
+
+
+def test_duplicate_rows_survive_recovery(workbook):
+    # imported logs may repeat (Timestamp, Record ID); recovery must not merge them
+    journal = JournaledBackend(workbook)
+    journal.append(row(1, "dup_01"))
+    journal.compact()
+    journal.append(row(1, "dup_01"))
+    workbook.locked = True
+    with pytest.raises(PermissionError):
+        journal.compact()
+    workbook.locked = False
+    journal = JournaledBackend(workbook)
+    assert list(workbook.read()["Record ID"]) == ["dup_01", "dup_01"]
+    assert len(journal.read()) == 2
+
+
+def test_failed_import_leaves_no_rows(workbook):
+    journal = JournaledBackend(workbook)
+    journal.append(row(1))
+
+    def chunks():
+        yield row(2)
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        journal.append_chunks(chunks())
+    assert list(journal.read()["Record ID"]) == ["genus_species_01"]
+    assert journal.pending() == 1
+    journal.append(row(3))
+    assert list(JournaledBackend(workbook).read()["Record ID"]) == ["genus_species_01", "genus_species_03"]
+
+
+def test_uncommitted_import_is_ignored_after_crash(workbook):
+    journal = JournaledBackend(workbook)
+    journal.append(row(1))
+    with open(journal.path, "a", encoding="utf-8") as f:   # a crash before the commit record
+        f.write('{"Timestamp": "2026-01-02 10:00", "Record ID": "x", "_seq": 2, "_txn": 2}\n')
+    journal = JournaledBackend(workbook)
+    assert len(journal.read()) == 1
+    journal.append(row(3))
+    journal.compact()
+    assert list(workbook.read()["Record ID"]) == ["genus_species_01", "genus_species_03"]
+
+
+def test_unreadable_workbook_is_not_marked_migrated(tmp_path):
+    legacy = os.path.join(tmp_path, "legacy.xlsx")
+    db = os.path.join(tmp_path, "log.sqlite3")
+    with open(legacy, "wb") as f:
+        f.write(b"not a workbook")
+    with pytest.raises(RuntimeError):
+        SQLiteBackend(db, legacy)
+
+    pd.concat([row(1), row(2)], ignore_index=True).to_excel(legacy, index=False)
+    assert len(SQLiteBackend(db, legacy).read()) == 2
+    assert len(SQLiteBackend(db, legacy).read()) == 2   # migrated once
@@ -0,0 +1,196 @@
+# tree_sync.py — keyed, diff-based updates for plain ttk.Treeviews
+import time
+from bisect import bisect_left
+
+import tkinter as tk
+from tkinter import ttk
+
+BUDGET_MS = 30   # Tk work per after() slice before yielding back to the event loop
+
+
+def _stable_positions(seq: list[int]) -> set[int]:
+    """Indexes into seq of one longest increasing subsequence (items that need not move)."""
+    tails: list[int] = []   # tails[k] = index in seq ending the best run of length k+1
+    tail_vals: list[int] = []
+    prev = [-1] * len(seq)
+    for i, v in enumerate(seq):
+        k = bisect_left(tail_vals, v)
+        if k:
+            prev[i] = tails[k - 1]
+        if k == len(tails):
+            tails.append(i)
+            tail_vals.append(v)
+        else:
+            tails[k] = i
+            tail_vals[k] = v
+    keep = set()
+    i = tails[-1] if tails else -1
+    while i >= 0:
+        keep.add(i)
+        i = prev[i]
+    return keep
+
+
+class TreeReconciler:
+    """
+    Keep a flat ttk.Treeview in step with a list of keyed rows by applying
+    only the difference from the last sync(): deleted keys are removed in one
+    call, new keys inserted, out-of-order keys moved (the longest already
+    ordered run stays put) and changed rows re-valued. Item ids are derived
+    from the row keys, so selection survives a sync, and the top visible row
+    is kept in view.
+    """
+
+    def __init__(self, tree: ttk.Treeview):
+        self.tree = tree
+        self.order: list[str] = []
+        self.rows: dict[str, tuple] = {}   # iid -> (values, tags) as last written
+        self.calls = 0                     # Tk calls issued, for benchmarks
+
+    @staticmethod
+    def iid_for(key, seen: dict) -> str:
+        # repeated keys get an occurrence suffix so every row still has its own item
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        k = key if isinstance(key, tuple) else (key,)
+        return "k:" + "\x1f".join(map(str, k)) + (f"#{n}" if n else "")
+
+    def sync(self, rows) -> int:
+        """rows: iterable of (key, values, tags) in display order. Returns the number of Tk calls."""
+        before = self.calls
+        for _ in self.steps(rows):
+            pass
+        return self.calls - before
+
+    def steps(self, rows):
+        """
+        sync() as a generator that yields the number of rows placed so far,
+        so a RenderScheduler can spread it over several after() slices.
+        Closing it early leaves the tree and this reconciler consistent: rows
+        not reached yet are either still shown with their old values or gone.
+        """
+        tree = self.tree
+        seen: dict = {}
+        target: list[str] = []
+        content: dict[str, tuple] = {}
+        for key, values, tags in rows:
+            iid = self.iid_for(key, seen)
+            target.append(iid)
+            content[iid] = (tuple(values), tuple(tags))
+
+        anchor = None
+        if self.order:
+            first = tree.yview()[0]
+            self.calls += 1
+            anchor = self.order[min(int(round(first * len(self.order))), len(self.order) - 1)]
+        selected = set(tree.selection()) if self.order else set()
+
+        gone = [iid for iid in self.order if iid not in content]
+        if gone:
+            tree.delete(*gone)
+            self.calls += 1
+            selected.difference_update(gone)
+            for iid in gone:
+                del self.rows[iid]
+
+        pos = {iid: i for i, iid in enumerate(target)}
+        survivors = [iid for iid in self.order if iid in content]
+        stay = {survivors[i] for i in _stable_positions([pos[iid] for iid in survivors])}
+        detached = {iid for iid in survivors if iid not in stay}
+        moved = bool(detached)
+        if detached:
+            tree.detach(*detached)   # the rest are already in relative order
+            self.calls += 1
+
+        done = 0
+        try:
+            for iid in target:
+                values, tags = content[iid]
+                old = self.rows.get(iid)
+                if old is None:
+                    tree.insert("", done, iid=iid, values=values, tags=tags)
+                    self.calls += 1
+                else:
+                    if iid in detached:
+                        tree.move(iid, "", done)
+                        detached.discard(iid)
+                        self.calls += 1
+                    if old != content[iid]:
+                        tree.item(iid, values=values, tags=tags)
+                        self.calls += 1
+                self.rows[iid] = content[iid]
+                done += 1
+                yield done
+        finally:
+            if detached:   # stopped early: drop rows that were taken out but not put back
+                tree.delete(*detached)
+                self.calls += 1
+                for iid in detached:
+                    del self.rows[iid]
+            self.order = target[:done] + [iid for iid in target[done:] if iid in stay]
+            if moved and set(tree.selection()) != selected - detached:
+                tree.selection_set(list(selected - detached))
+                self.calls += 1
+            if done == len(target) and anchor in pos and (gone or moved or len(target) != len(survivors)):
+                tree.yview_moveto(pos[anchor] / len(target))
+                self.calls += 1
+
+    def clear(self) -> int:
+        return self.sync(())
+
+
+class RenderScheduler:
+    """
+    Drive a render generator (e.g. TreeReconciler.steps()) in after() slices
+    of about budget_ms each, so a large result set never blocks the event
+    loop. While a render spans several slices status("Loading N/M…") is
+    reported, and status("") when it ends. start() aborts a render that is
+    still in progress, so only the newest one ever finishes.
+    """
+
+    def __init__(self, widget: tk.Misc, status=None, budget_ms: int = BUDGET_MS):
+        self.widget = widget
+        self.status = status or (lambda text: None)
+        self.budget_ms = budget_ms
+        self._steps = None
+        self._total = 0
+        self._on_done = None
+        self._after = None
+        self._reported = False
+
+    def start(self, steps, total: int, on_done=None):
+        self.abort()
+        self._steps, self._total, self._on_done = steps, total, on_done
+        self._run()
+
+    def busy(self) -> bool:
+        return self._steps is not None
+
+    def abort(self):
+        if self._after is not None:
+            self.widget.after_cancel(self._after)
+            self._after = None
+        if self._steps is not None:
+            self._steps.close()
+            self._steps = None
+            self._end_status()
+
+    def _end_status(self):
+        if self._reported:
+            self._reported = False
+            self.status("")
+
+    def _run(self):
+        self._after = None
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        done = 0
+        for done in self._steps:
+            if time.perf_counter() >= deadline:
+                self._reported = True
+                self.status(f"Loading {done:,}/{self._total:,}…")
+                self._after = self.widget.after(1, self._run)
+                return
+        self._steps = None
+        self._end_status()
+        if self._on_done:
+            self._on_done()
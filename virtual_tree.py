@@ -0,0 +1,199 @@
+# virtual_tree.py — virtualized ttk.Treeview for large DataFrames
+from __future__ import annotations
+
+from tkinter import ttk
+
+from lazy_import import lazy_module
+pd = lazy_module("pandas")
+
+BUFFER_ROWS = 8   # extra rows materialized below the viewport
+
+
+class VirtualTreeview:
+    """
+    Drive a ttk.Treeview from a DataFrame while only materializing the rows in
+    the visible viewport (plus BUFFER_ROWS). The tree holds a fixed pool of
+    slot items whose values are swapped as the user scrolls, so render cost
+    depends on the window height, not on the number of rows.
+
+    Scrolling (scrollbar, wheel, arrow/page keys) moves `top`; the tree's own
+    yview always stays at 0. Selection is tracked by row key (key_columns),
+    so it survives scrolling and reloads. A slot is only rewritten when its
+    values or tags differ from what it already shows, so a reload that
+    leaves the viewport alone costs no item updates.
+    """
+
+    def __init__(self, tree: ttk.Treeview, vsb: ttk.Scrollbar, columns: list[str],
+                 key_columns: tuple[str, ...], row_tags=None, buffer: int = BUFFER_ROWS):
+        self.tree = tree
+        self.vsb = vsb
+        self.columns = list(columns)
+        self.key_columns = tuple(key_columns)
+        self.row_tags = row_tags or (lambda row: [])
+        self.buffer = buffer
+
+        self.df = pd.DataFrame(columns=self.columns)
+        self.top = 0
+        self.cursor = 0
+        self.selected: set = set()
+        self._slots: list[str] = []
+        self._slot_keys: dict[str, tuple] = {}
+        self._slot_content: dict[str, tuple] = {}   # iid -> (values, tags) last written
+        self._expected_sel: tuple = ()
+        self._extend = False
+
+        tree.configure(yscrollcommand="")
+        vsb.configure(command=self.yview)
+        tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        tree.bind("<Configure>", lambda e: self.render(), add="+")
+        tree.bind("<ButtonPress-1>", lambda e: self._note_modifiers(e), add="+")
+        tree.bind("<MouseWheel>", self._on_wheel)
+        tree.bind("<Button-4>", lambda e: self.scroll(-3) or "break")
+        tree.bind("<Button-5>", lambda e: self.scroll(3) or "break")
+        for seq, fn in (("<Up>", lambda: self.move_cursor(-1)),
+                        ("<Down>", lambda: self.move_cursor(1)),
+                        ("<Prior>", lambda: self.move_cursor(-self.visible_rows())),
+                        ("<Next>", lambda: self.move_cursor(self.visible_rows())),
+                        ("<Home>", lambda: self.move_cursor(-len(self.df))),
+                        ("<End>", lambda: self.move_cursor(len(self.df)))):
+            tree.bind(seq, lambda e, fn=fn: fn() or "break")
+
+    # ---------- data ----------
+    def set_frame(self, df: pd.DataFrame):
+        """Show df (any index); keeps scroll position and still-present selections."""
+        self.df = df
+        if self.selected:
+            present = set(zip(*(df[c] for c in self.key_columns)))
+            self.selected &= present
+        self.cursor = min(self.cursor, max(len(df) - 1, 0))
+        self.render()
+
+    def row_key(self, pos: int) -> tuple:
+        row = self.df.iloc[pos]
+        return tuple(row[c] for c in self.key_columns)
+
+    def selected_rows(self) -> list[dict]:
+        """Selected rows as dicts, in display order."""
+        if not self.selected:
+            return []
+        keys = list(zip(*(self.df[c] for c in self.key_columns)))
+        hit = [i for i, k in enumerate(keys) if k in self.selected]
+        return self.df.iloc[hit].to_dict(orient="records")
+
+    def clear_selection(self):
+        self.selected.clear()
+        self.render()
+
+    # ---------- geometry ----------
+    def visible_rows(self) -> int:
+        h = self.tree.winfo_height()
+        rowheight = int(ttk.Style(self.tree).lookup("Treeview", "rowheight") or 20)
+        header = rowheight
+        if self._slots:
+            bbox = self.tree.bbox(self._slots[0])
+            if bbox:
+                header = bbox[1]
+        return max(1, (h - header) // rowheight)
+
+    def _clamp_top(self, top: int) -> int:
+        return max(0, min(top, len(self.df) - self.visible_rows()))
+
+    # ---------- scrolling ----------
+    def yview(self, *args):
+        n = len(self.df)
+        if not args or not n:
+            return
+        if args[0] == "moveto":
+            top = int(float(args[1]) * n)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            top = self.top + (step * self.visible_rows() if args[2] == "pages" else step)
+        else:
+            return
+        self._scroll_to(top)
+
+    def scroll(self, rows: int):
+        self._scroll_to(self.top + rows)
+
+    def _on_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _scroll_to(self, top: int):
+        top = self._clamp_top(top)
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def move_cursor(self, delta: int):
+        if not len(self.df):
+            return
+        self.cursor = max(0, min(self.cursor + delta, len(self.df) - 1))
+        self.selected = {self.row_key(self.cursor)}
+        vis = self.visible_rows()
+        if self.cursor < self.top:
+            self.top = self.cursor
+        elif self.cursor >= self.top + vis:
+            self.top = self.cursor - vis + 1
+        self.top = self._clamp_top(self.top)
+        self.render()
+
+    # ---------- selection ----------
+    def _note_modifiers(self, event):
+        # Shift (0x1) / Control (0x4): extend the selection instead of replacing it
+        self._extend = bool(event.state & 0x0005)
+
+    def _on_select(self, _event=None):
+        sel = self.tree.selection()
+        if sel == self._expected_sel:
+            return  # our own render
+        visible = set(self._slot_keys.values())
+        picked = {self._slot_keys[iid] for iid in sel if iid in self._slot_keys}
+        if self._extend:
+            self.selected = (self.selected - visible) | picked
+        else:
+            self.selected = picked
+        self._extend = False
+        if sel:
+            pos = self._slots.index(sel[-1]) if sel[-1] in self._slots else 0
+            self.cursor = min(self.top + pos, max(len(self.df) - 1, 0))
+        self._expected_sel = sel
+        self.tree.yview_moveto(0)
+
+    # ---------- rendering ----------
+    def _ensure_slots(self, count: int):
+        while len(self._slots) < count:
+            self._slots.append(self.tree.insert("", "end", iid=f"slot{len(self._slots)}", values=()))
+        while len(self._slots) > count:
+            iid = self._slots.pop()
+            self.tree.delete(iid)
+            self._slot_content.pop(iid, None)
+
+    def render(self):
+        n = len(self.df)
+        self.top = self._clamp_top(self.top)
+        want = min(n - self.top, self.visible_rows() + self.buffer)
+        self._ensure_slots(max(want, 0))
+        window = self.df.iloc[self.top:self.top + want]
+        self._slot_keys = {}
+        sel = []
+        for i, (iid, row) in enumerate(zip(self._slots, window.to_dict(orient="records"))):
+            key = tuple(row[c] for c in self.key_columns)
+            tags = list(self.row_tags(row))
+            if (self.top + i) % 2 == 0:
+                tags.append("zebra_even")
+            content = (tuple(row.get(c, "") for c in self.columns), tuple(tags))
+            if self._slot_content.get(iid) != content:
+                self.tree.item(iid, values=content[0], tags=content[1])
+                self._slot_content[iid] = content
+            self._slot_keys[iid] = key
+            if key in self.selected:
+                sel.append(iid)
+        if tuple(sel) != tuple(self.tree.selection()):
+            self.tree.selection_set(sel)
+        self._expected_sel = tuple(sel)
+        self.tree.yview_moveto(0)
+        if n:
+            self.vsb.set(self.top / n, min(1.0, (self.top + self.visible_rows()) / n))
+        else:
+            self.vsb.set(0.0, 1.0)